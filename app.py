@@ -2,90 +2,538 @@
 """
 Main Flask application for the Smart Mirror project.
 
-This application dynamically loads modules based on the configuration in config.py
+This application loads modules once at startup based on the configuration in config.py
 and renders them into the appropriate positions in the HTML template.
 """
 
-import importlib
+import hmac
+import json
+import os
+import threading
+import time
+from functools import wraps
 
-from flask import Flask, render_template, jsonify
+import config
 
-from config import MODULE_LAYOUT
+from flask import (
+    Flask, Response, abort, jsonify, make_response, render_template, request,
+    send_from_directory, url_for,
+)
+from werkzeug.routing import Rule
+
+from assets import AssetBundle
+from config import ADMIN_TOKEN, API_POLL_INTERVAL, CONFIG_RELOAD, MODULE_LAYOUT, ROLE, SNAPSHOT_DB
+from circuit_breaker import circuit_breakers
+from config_watcher import ConfigWatcher
+from http_client import http_client
+from metrics import CACHE_REQUESTS, metrics
+from profiler import profiler
+from registry import ModuleRegistry
+from scheduler import Scheduler
+from snapshot_store import SnapshotStore
 
 
 app = Flask(__name__)
-loaded_modules = {}
+registry = ModuleRegistry(MODULE_LAYOUT, template_dirs=(os.path.join(app.root_path, 'templates'),))
+scheduler = Scheduler(store=SnapshotStore(SNAPSHOT_DB) if SNAPSHOT_DB else None)
+# The page's scripts: the shared helpers, then each configured module's own script.
+script_bundle = AssetBundle('app', lambda: [
+    os.path.join(app.static_folder, 'js', 'format_time.js'),
+    os.path.join(app.static_folder, 'js', 'script.js'),
+] + [
+    os.path.join(app.root_path, 'modules', mod_name, 'static', 'module.js')
+    # A copy: a config reload may change the layout while the bundle is checked.
+    for mod_name in list(MODULE_LAYOUT)
+])
+
+# Seconds an API request waits for the very first snapshot of a module before giving up.
+FIRST_SNAPSHOT_TIMEOUT = 30
+# Seconds between keep-alive comments on an idle /api/stream connection.
+STREAM_HEARTBEAT = 15
+# Seconds the index page waits for modules still loading at startup, so the first
+# page a display gets is complete.
+WARM_UP_TIMEOUT = 15
+
+# Seconds between two status reports the scraper publishes for the web workers.
+STATUS_PUBLISH_INTERVAL = 5
+
+# API endpoint path -> module name, kept in step with MODULE_LAYOUT across reloads.
+api_routes: dict[str, str] = {}
+# What this process does with module data; set by init_app().
+process_role = 'all'
+
+
+def is_admin(token: str | None) -> bool:
+    """Return whether `token` matches the configured admin token."""
+    return ADMIN_TOKEN is not None and token is not None and \
+        hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def profiled(view):
+    """Profile a sampled fraction of calls to `view`, or the ones an admin asks for.
+
+    An admin forces profiling of a single request with `?profile=<admin token>`.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        force = is_admin(request.args.get('profile'))
+        with profiler.profile('request', request.path, force=force):
+            return view(*args, **kwargs)
+    return wrapper
 
 
 @app.route('/')
+@profiled
 def index():
     """Render the main page with modules loaded as per configuration.
 
+    The page is pre-rendered by the module registry and only rebuilt when the
+    configuration or a module's templates change, so most requests are answered
+    from memory or with a 304.
+
+    Returns:
+        Response: Rendered HTML page.
+    """
+    registry.wait_warm(WARM_UP_TIMEOUT)
+    script = script_bundle.get()
+    page = registry.page(lambda modules: render_template(
+        'index.html', modules=modules, poll_interval=API_POLL_INTERVAL,
+        script_url=url_for('asset', filename=script.filename),
+    ), key=script.filename)
+    response = make_response(page.html)
+    response.set_etag(page.etag)
+    response.last_modified = page.last_modified
+    return response.make_conditional(request)
+
+
+@app.route('/assets/<filename>')
+def asset(filename):
+    """Serve a build of the script bundle.
+
+    Bundle names carry a hash of their content, so browsers may cache them forever
+    and only download a bundle again once the page links a new one.
+
+    Returns:
+        Response: The minified bundle, gzip-compressed for clients that accept it.
+    """
+    bundle = script_bundle.find(filename)
+    if bundle is None:
+        abort(404)
+    use_gzip = request.accept_encodings.quality('gzip') > 0
+    etag = f'{bundle.etag}-gzip' if use_gzip else bundle.etag
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif use_gzip:
+        response = Response(bundle.gzip_body, mimetype=bundle.mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(bundle.body, mimetype=bundle.mimetype)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+@app.route('/api/all')
+def api_all():
+    """Return the data of every API module in a single response.
+
+    Each entry carries the snapshot's version, fetch time and staleness. Clients can
+    pass the versions they already hold as query parameters (e.g., `?weather=3&kbo=7`);
+    modules whose version matches are left out, so an unchanged poll returns `{}`.
+
+    Returns:
+        Response: JSON mapping of module name to
+            `{version, fetched_at, age, stale, error, data}`.
+    """
+    known_versions = {mod_name: request.args.get(mod_name, type=int) for mod_name in request.args}
+    return jsonify({
+        mod_name: snapshot_entry(mod_name, snapshot)
+        for mod_name, snapshot in scheduler.changed_since(known_versions).items()
+        # Web workers may still hold snapshots of modules a reload removed.
+        if mod_name in MODULE_LAYOUT
+    })
+
+
+@app.route('/api/stream')
+def api_stream():
+    """Push module data to the client as server-sent events.
+
+    An `update` event is sent whenever a module's data changes, with the same
+    `{module, version, fetched_at, age, stale, error, data}` payload as an `/api/all`
+    entry. Versions
+    the client already holds can be passed as query parameters, like `/api/all`.
+    Idle connections only receive a keep-alive comment every `STREAM_HEARTBEAT` seconds.
+
+    Returns:
+        Response: A `text/event-stream` response that stays open.
+    """
+    known_versions = {mod_name: request.args.get(mod_name, type=int) for mod_name in request.args}
+
+    def events():
+        yield 'retry: 5000\n\n'
+        while True:
+            changed = scheduler.wait_for_changes(known_versions, timeout=STREAM_HEARTBEAT)
+            if not changed:
+                yield ': keep-alive\n\n'
+                continue
+            for mod_name, snapshot in changed.items():
+                known_versions[mod_name] = snapshot.version
+                payload = json.dumps({'module': mod_name, **snapshot_entry(mod_name, snapshot)})
+                yield f'event: update\ndata: {payload}\n\n'
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+
+def module_error(mod_name):
+    """Return why `mod_name`'s snapshot is not being refreshed, or None if it is.
+
+    That is the error of its latest failed refresh, or of a failed (re)load, after
+    which the last snapshot keeps being served until the module loads again.
+    """
+    return scheduler.failure(mod_name) or registry.error(mod_name)
+
+
+def snapshot_entry(mod_name, snapshot):
+    """Return the JSON-serializable form of a snapshot used by /api/all and /api/stream.
+
+    `age` is the seconds since the data was fetched. `stale` is set while the data
+    comes from a previous run or the latest refresh or reload failed, and `error` then
+    says why.
+    """
+    error = module_error(mod_name)
+    return {
+        'version': snapshot.version,
+        'fetched_at': snapshot.fetched_at,
+        'age': round(time.time() - snapshot.fetched_at, 1),
+        'stale': snapshot.stale or error is not None,
+        'error': error,
+        'data': snapshot.data,
+    }
+
+
+@app.route('/ready')
+def ready():
+    """Report whether every module is loaded, rendered and, for API modules, has data.
+
     Returns:
-        str: Rendered HTML page.
+        Response: JSON `{ready, modules}` where `modules` maps each module name to its
+            `state`, whether it is `rendered` and, for API modules, whether it has `data`.
+            The status is 200 once everything is warm and 503 until then.
+    """
+    modules = registry.readiness()
+    for mod_name, mod_state in modules.items():
+        if 'api_endpoint' in MODULE_LAYOUT.get(mod_name, {}):
+            mod_state['data'] = scheduler.get(mod_name) is not None
+    is_ready = all(
+        mod_state['state'] == 'ready' and mod_state['rendered'] and mod_state.get('data', True)
+        for mod_state in modules.values()
+    )
+    return jsonify({'ready': is_ready, 'modules': modules}), 200 if is_ready else 503
+
+
+def module_status():
+    """Return the runtime state of every loaded module that exposes one, by module name."""
+    return {
+        mod_name: mod_state
+        for mod_name, mod_instance in list(registry.modules.items())
+        if (mod_state := mod_instance.status())
+    }
+
+
+# Status reports by name. Web workers never fetch anything, so they answer with the
+# reports the scraper publishes to the snapshot store instead of their own.
+STATUS_REPORTS = {
+    'modules': module_status,
+    'http': http_client.stats,
+    'circuits': circuit_breakers.stats,
+}
+
+
+def status_response(name):
+    """Return the status report `name` of the process that refreshes module data.
+
+    A web worker serves the scraper's latest published report, with its `Age`.
     """
-    modules_by_position = {}
+    if process_role != 'web':
+        return jsonify(STATUS_REPORTS[name]())
+    try:
+        stored = scheduler.store.load_status(name)
+    except Exception as e:
+        print(f"Failed to read status report '{name}': {e}")
+        stored = None
+    if stored is None:
+        # The scraper hasn't published yet.
+        return jsonify({}), 503
+    report, updated_at = stored
+    response = jsonify(report)
+    response.age = max(int(time.time() - updated_at), 0)
+    return response
+
 
-    # Iterate through each module specified in the configuration.
-    for mod_name, mod_config in MODULE_LAYOUT.items():
+def publish_status():
+    """Publish this process's status reports to the snapshot store, periodically."""
+    while True:
         try:
-            # Dynamically import the module from the modules directory.
-            mod_module = importlib.import_module(f'modules.{mod_name}')
-            mod_instance = mod_module.get_module()
-            loaded_modules[mod_name] = mod_instance
-            position = mod_config.get('position', 'default')
-            # Get the module's HTML content.
-            rendered_html = mod_instance.render()
-            # Build inline style string based on configuration settings
-            style = ''
-            if 'width' in mod_config:
-                style += f'width: {mod_config['width']};'
-            if 'height' in mod_config:
-                style += f' height: {mod_config['height']};'
-            # Wrap the module's HTML in a container div with the inline style
-            container_html = f"<div class='module' style='{style}'>{rendered_html}</div>"
-            # Group module output by its configured position.
-            modules_by_position.setdefault(position, []).append(container_html)
+            scheduler.store.save_status(
+                {name: report() for name, report in STATUS_REPORTS.items()}, time.time()
+            )
         except Exception as e:
-            print(f"Failed to load module '{mod_name}': {e}")
-            continue
-    return render_template('index.html', modules=modules_by_position)
+            print(f'Failed to publish status: {e}')
+        time.sleep(STATUS_PUBLISH_INTERVAL)
+
+
+@app.route('/status')
+def status():
+    """Report the runtime state of every loaded module that exposes one.
+
+    Returns:
+        Response: JSON mapping of module name to its state.
+    """
+    return status_response('modules')
+
+
+@app.route('/status/http')
+def http_status():
+    """Report per-host counters of the shared upstream HTTP client.
+
+    Returns:
+        Response: JSON mapping of host to request, byte, connection and 304 counts.
+    """
+    return status_response('http')
+
+
+@app.route('/status/circuits')
+def circuit_status():
+    """Report the circuit breaker of every upstream host contacted so far.
+
+    Returns:
+        Response: JSON mapping of host to its breaker `state` ('closed', 'open' or
+            'half-open'), consecutive `failures` and `last_error`.
+    """
+    return status_response('circuits')
+
+
+@app.route('/profiles')
+def profiles():
+    """List the saved profiles, newest first (admin only).
+
+    Pass the admin token as `?token=`. Each listed file can be downloaded from
+    `/profiles/<name>` and read with `python -m pstats`.
+
+    Returns:
+        Response: JSON list of `{name, size, created}`.
+    """
+    if not is_admin(request.args.get('token')):
+        abort(403)
+    return jsonify(profiler.list())
+
+
+@app.route('/profiles/<name>')
+def profile_file(name):
+    """Download one saved profile (admin only)."""
+    if not is_admin(request.args.get('token')):
+        abort(403)
+    return send_from_directory(profiler.directory, name, as_attachment=True)
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose module, upstream, parse and cache metrics for Prometheus to scrape.
+
+    Returns:
+        Response: Metrics in the Prometheus text exposition format.
+    """
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def snapshot_response(mod_name, snapshot):
+    """Build the HTTP response for a module snapshot.
+
+    The body is serialized and compressed once per snapshot. Requests whose
+    `If-None-Match` carries the snapshot's ETag get an empty 304, and clients that
+    accept gzip get the pre-compressed body. Staleness goes in the headers: `Age`
+    always, and `Warning: 110` while the snapshot is stale.
+
+    Args:
+        mod_name (str): Module the snapshot belongs to.
+        snapshot (Snapshot): Snapshot to send.
+
+    Returns:
+        Response: A 200 JSON response, or a 304 without a body.
+    """
+    use_gzip = request.accept_encodings.quality('gzip') > 0
+    # Each encoding is a different representation, so it gets its own strong ETag.
+    etag = f'{snapshot.etag}-gzip' if use_gzip else snapshot.etag
+    not_modified = request.if_none_match.contains(etag)
+    CACHE_REQUESTS.inc(cache='api_etag', result='hit' if not_modified else 'miss')
+    if not_modified:
+        response = Response(status=304)
+    elif use_gzip:
+        response = Response(snapshot.gzip_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(snapshot.body, mimetype='application/json')
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.age = max(int(time.time() - snapshot.fetched_at), 0)
+    if snapshot.stale or module_error(mod_name) is not None:
+        response.headers['Warning'] = '110 - "Response is Stale"'
+    return response
+
+
+@profiled
+def module_api():
+    """Return the cached snapshot of the module whose 'api_endpoint' was requested.
+
+    Returns:
+        Response: The snapshot as JSON, or a 503 while the module has no data.
+    """
+    mod_name = api_routes.get(request.url_rule.rule)
+    if mod_name is None:
+        # The endpoint was removed from the configuration by a reload.
+        abort(404)
+    if registry.state(mod_name) == 'failed':
+        # Nothing is refreshing it; serve whatever data is left, as stale.
+        snapshot = scheduler.get(mod_name)
+    else:
+        snapshot = scheduler.wait(mod_name, FIRST_SNAPSHOT_TIMEOUT)
+    if snapshot is None:
+        return jsonify({}), 503
+    return snapshot_response(mod_name, snapshot)
 
 
 def register_api_endpoints():
-    """Automatically register API endpoints for modules with an 'api_endpoint' defined."""
-    for mod_name, mod_config in MODULE_LAYOUT.items():
-        if 'api_endpoint' in mod_config:
-            try:
-                # Ensure the module instance is loaded.
-                mod_instance = loaded_modules.get(mod_name)
-                if mod_instance is None:
-                    mod_module = importlib.import_module(f'modules.{mod_name}')
-                    mod_instance = mod_module.get_module()
-                    loaded_modules[mod_name] = mod_instance
-
-                # Check if the module implements an 'api' method.
-                if hasattr(mod_instance, 'api') and callable(getattr(mod_instance, 'api')):
-                    endpoint = mod_config['api_endpoint']
-
-                    def create_api_func(module_instance):
-                        """Create an API function that returns the module's API data as JSON."""
-                        def api_func():
-                            return jsonify(module_instance.api())
-                        return api_func
-
-                    api_func = create_api_func(mod_instance)
-                    # Register the endpoint with a unique name.
-                    app.add_url_rule(endpoint, endpoint + '_api', api_func)
-                else:
-                    print(
-                        f"Module '{mod_name}' does not implement an 'api' method; "
-                        'skipping API endpoint registration.'
-                    )
-            except Exception as e:
-                print(f"Failed to register API endpoint for module '{mod_name}': {e}")
+    """Route the 'api_endpoint' of every module in the layout to `module_api`.
 
+    Routes are added from the configuration alone, before the modules are loaded, so
+    they exist by the time the server accepts its first request. Rules go straight into
+    the URL map, because Flask rejects `add_url_rule()` once it has served a request
+    and a config reload can add endpoints at any time.
+    """
+    routes = {
+        mod_config['api_endpoint']: mod_name
+        for mod_name, mod_config in list(MODULE_LAYOUT.items())
+        if 'api_endpoint' in mod_config
+    }
+    app.view_functions.setdefault('module_api', module_api)
+    existing = {rule.rule for rule in app.url_map.iter_rules()}
+    for endpoint in routes:
+        if endpoint not in existing:
+            app.url_map.add(Rule(endpoint, endpoint='module_api', methods=['GET']))
+    api_routes.update(routes)
+    for endpoint in set(api_routes) - set(routes):
+        del api_routes[endpoint]
 
-if __name__ == '__main__':
+
+def schedule_module(mod_name, mod_instance):
+    """Start refreshing a loaded module's API data in the background.
+
+    Calling it again after a config reload updates the refresh interval, or stops
+    refreshing if the module no longer has an 'api_endpoint'.
+    """
+    mod_config = MODULE_LAYOUT.get(mod_name, {})
+    if 'api_endpoint' not in mod_config:
+        scheduler.remove(mod_name)
+        return
+    # Check if the module implements an 'api' method.
+    if not callable(getattr(mod_instance, 'api', None)):
+        print(f"Module '{mod_name}' does not implement an 'api' method; not refreshing it.")
+        return
+    # refresh_interval is in milliseconds.
+    interval = mod_config.get('refresh_interval', 3600000) / 1000
+    scheduler.add(
+        mod_name, mod_instance.api, interval,
+        next_interval=getattr(mod_instance, 'next_refresh', None),
+    )
+
+
+def reload_layout(layout: dict, refresh: bool = True):
+    """Apply a reloaded MODULE_LAYOUT, touching only the modules whose entries changed.
+
+    Args:
+        layout (dict): The new module layout.
+        refresh (bool): Whether this process refreshes module data, i.e. whether
+            background jobs follow the layout too.
+    """
+    # The jobs of unloaded modules stop before their instances are closed; reloaded
+    # modules keep serving their snapshot, as stale if the new instance fails to load.
+    diff = registry.reconfigure(layout, on_unload=scheduler.cancel if refresh else None)
+    if not diff:
+        return
+    print(f'Reloaded module layout: {diff}')
+    register_api_endpoints()
+    for mod_name in diff.removed:
+        scheduler.remove(mod_name)
+    if refresh:
+        # Changed modules keep their job; only a new refresh interval is applied,
+        # and their data is refetched if the change affects it.
+        for mod_name in diff.changed:
+            mod_instance = registry.get(mod_name)
+            if mod_instance is not None:
+                schedule_module(mod_name, mod_instance)
+        for mod_name in diff.refreshed:
+            scheduler.refresh(mod_name)
+    if diff.added or diff.reloaded:
+        # A reloaded module keeps serving its snapshot until the new instance's job
+        # replaces it.
+        registry.warm_up(
+            on_loaded=schedule_module if refresh else None, names=diff.added + diff.reloaded
+        )
+
+
+def init_app(role: str = 'all'):
+    """Register API endpoints, then load modules and start refreshing in the background.
+
+    Returns as soon as the routes exist; modules are loaded concurrently afterwards
+    and `/ready` reports their progress.
+
+    Args:
+        role (str): What this process does with module data:
+            - `'all'`: refresh modules itself and serve them (single process).
+            - `'scraper'`: only refresh modules and publish them to the snapshot store.
+            - `'web'`: only serve the snapshots another process publishes to the store.
+
+    Raises:
+        ValueError: If `role` is unknown, or requires a snapshot store that is disabled.
+    """
+    if role not in ('all', 'scraper', 'web'):
+        raise ValueError(f"Unknown role '{role}'; expected 'all', 'scraper' or 'web'")
+    if role != 'all' and scheduler.store is None:
+        raise ValueError(f"Role '{role}' requires SMARTMIRROR_SNAPSHOT_DB to be set")
+    global process_role
+    process_role = role
     register_api_endpoints()
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    if CONFIG_RELOAD:
+        ConfigWatcher(
+            config.__file__, on_change=lambda layout: reload_layout(layout, refresh=role != 'web')
+        ).start()
+    if role != 'scraper':
+        # Minify the scripts now rather than on the first page request.
+        script_bundle.get()
+    if role == 'web':
+        # Modules are only loaded to render the page; the scraper refreshes them.
+        scheduler.follow()
+        registry.warm_up()
+    else:
+        # Serve the last good data from the previous run while fresh fetches start.
+        scheduler.restore()
+        scheduler.start()
+        registry.warm_up(on_loaded=schedule_module)
+    if role == 'scraper':
+        threading.Thread(target=publish_status, name='status-publisher', daemon=True).start()
+
+
+if __name__ == '__main__':
+    debug = True
+    # With debug=True the reloader runs this file in a parent and a child process;
+    # only the child serving requests should load and refresh modules.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        init_app(ROLE)
+    # config.py is reloaded in place by the ConfigWatcher; don't let an edit to it
+    # restart the whole server.
+    app.run(host='0.0.0.0', port=5000, debug=debug,
+            exclude_patterns=[config.__file__] if CONFIG_RELOAD else None)
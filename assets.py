@@ -0,0 +1,122 @@
+# assets.py
+
+"""
+Bundled static assets with content-hashed names.
+
+The shared scripts and every module's `static/module.js` are concatenated and
+minified into one bundle named after a hash of its content (e.g.,
+`app.3f2a9c1d0b4e.js`). Because a changed bundle gets a new name, browsers can cache
+each one forever, and the index page only carries the modules' configuration.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable
+
+# rjsmin strips comments and whitespace safely; fall back to trimming lines when missing.
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+
+def minify_js(source: str) -> str:
+    """Return `source` with comments and insignificant whitespace removed.
+
+    Without rjsmin, only indentation, blank lines and whole-line `//` comments are
+    removed, which is safe for any script.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One build of a bundle.
+
+    Attributes:
+        filename (str): Content-hashed file name (e.g., `app.3f2a9c1d0b4e.js`).
+        body (bytes): Minified bundle content.
+        mimetype (str): Content type the bundle is served with.
+    """
+
+    filename: str
+    body: bytes
+    mimetype: str
+
+    @cached_property
+    def etag(self) -> str:
+        return hashlib.sha256(self.body).hexdigest()
+
+    @cached_property
+    def gzip_body(self) -> bytes:
+        """`body` compressed with gzip, computed once per build."""
+        return gzip.compress(self.body, mtime=0)
+
+
+class AssetBundle:
+    """A script bundle rebuilt whenever one of its source files changes.
+
+    Example:
+        bundle = AssetBundle('app', lambda: ['static/js/script.js'])
+        asset = bundle.get()
+    """
+
+    HASH_LENGTH = 12
+    MIMETYPES = {'js': 'text/javascript', 'css': 'text/css'}
+
+    def __init__(self, name: str, sources: Callable[[], list[str]],
+                 minify: Callable[[str], str] = minify_js, extension: str = 'js'):
+        """
+        Args:
+            name (str): Prefix of the bundle's file name.
+            sources (Callable[[], list[str]]): Returns the files to bundle, in order.
+                Missing files are skipped.
+            minify (Callable[[str], str]): Applied to each source file.
+            extension (str): File name extension, which also picks the content type.
+        """
+        self.name = name
+        self.sources = sources
+        self.minify = minify
+        self.extension = extension
+        self._key = None
+        self._current = None
+        # Every build stays available, so a page rendered just before a rebuild still works.
+        self._builds: dict[str, Asset] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> Asset:
+        """Return the current build, rebuilding it if a source file changed."""
+        paths = [path for path in self.sources() if os.path.isfile(path)]
+        key = tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+        if key != self._key:
+            with self._lock:
+                if key != self._key:
+                    self._current = self._build(paths)
+                    self._builds[self._current.filename] = self._current
+                    self._key = key
+        return self._current
+
+    def find(self, filename: str) -> Asset | None:
+        """Return the build named `filename`, or None if there is none."""
+        return self._builds.get(filename)
+
+    def _build(self, paths: list[str]) -> Asset:
+        parts = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as file:
+                parts.append(self.minify(file.read()))
+        # A separator keeps a file without a trailing semicolon from merging into the next.
+        body = ';\n'.join(parts).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:self.HASH_LENGTH]
+        return Asset(
+            filename=f'{self.name}.{digest}.{self.extension}',
+            body=body,
+            mimetype=self.MIMETYPES[self.extension],
+        )
@@ -0,0 +1,71 @@
+# benchmarks/bench_render.py
+
+"""
+Benchmark the cost of `render()` per module.
+
+Compares the original implementation of `BaseModule.render_template`, which reads and
+compiles the template file on every call, with the shared cached Jinja environment.
+
+Usage:
+    python -m benchmarks.bench_render [--number 200]
+"""
+
+import argparse
+import importlib
+import timeit
+
+from jinja2 import Template
+
+from config import MODULE_LAYOUT
+from module import BaseModule
+
+
+def legacy_render_template(self, template_path: str, **context) -> str:
+    """Read and compile the template on every call, as `render_template` used to."""
+    with open(template_path, 'r', encoding='utf-8') as file:
+        template_content = file.read()
+    template = Template(template_content)
+    return template.render(context)
+
+
+def load_modules():
+    """Instantiate every configured module that can be loaded in this environment."""
+    modules = {}
+    for mod_name in MODULE_LAYOUT:
+        try:
+            modules[mod_name] = importlib.import_module(f'modules.{mod_name}').get_module()
+        except Exception as e:
+            print(f"Skipping module '{mod_name}': {e}")
+    return modules
+
+
+def measure(mod_instance, number: int) -> float:
+    """Return the mean cost of one `render()` call in microseconds."""
+    mod_instance.render()
+    return timeit.timeit(mod_instance.render, number=number) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=200, help='renders per module')
+    args = parser.parse_args()
+
+    modules = load_modules()
+    cached_render_template = BaseModule.render_template
+    results = {}
+    for mod_name, mod_instance in modules.items():
+        BaseModule.render_template = legacy_render_template
+        try:
+            before = measure(mod_instance, args.number)
+        finally:
+            BaseModule.render_template = cached_render_template
+        after = measure(mod_instance, args.number)
+        results[mod_name] = (before, after)
+
+    print(f"{'module':<12} {'before (us)':>12} {'after (us)':>12} {'speedup':>8}")
+    for mod_name, (before, after) in results.items():
+        print(f'{mod_name:<12} {before:>12.1f} {after:>12.1f} {before / after:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+# benchmarks/bench_suite.py
+
+"""
+Offline benchmark suite for the scraping, parsing and rendering hot paths.
+
+Every upstream page is replaced by a saved fixture from `benchmarks/fixtures`,
+served by a local HTTP stand-in, so runs are repeatable and need no network. The
+suite measures:
+
+- `extract`: parse time and memory of each extractor (weather, air, HYU, KBO).
+- `render`: the cost of `render()` per module.
+- `http`: latency of `/` and each `/api/*` endpoint through the Flask test client.
+- `import`: cold import time of the application, and what each module adds to it.
+
+Results can be saved as a JSON baseline and later runs compared against it.
+
+Usage:
+    python -m benchmarks.bench_suite [--save] [--compare] [--baseline PATH]
+"""
+
+import os
+
+# Benchmarks must not read or overwrite the snapshots of a real installation.
+os.environ['SMARTMIRROR_SNAPSHOT_DB'] = ''
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+from config import MODULE_LAYOUT
+from selector import load_selectors
+from .fixture_server import FIXTURE_DIR, FixtureServer
+from .import_report import import_times, target_costs
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Relative slowdown (or memory growth) over the baseline reported as a regression.
+DEFAULT_THRESHOLD = 0.25
+# Absolute changes below these are run-to-run noise, whatever their relative size.
+NOISE_FLOOR = {'min_ms': 0.5, 'peak_kib': 64}
+
+
+def measure(func, number: int, repeat: int = 5) -> dict:
+    """Time `func` and record the memory one call allocates.
+
+    Args:
+        func (Callable): Zero-argument callable to benchmark.
+        number (int): Calls per timing run.
+        repeat (int): Timing runs; the fastest and the mean are reported.
+
+    Returns:
+        dict: `min_ms` and `mean_ms` per call, `peak_kib` traced during one call, and
+            `retained_kib` / `retained_blocks` still allocated when it returns.
+    """
+    func()
+    runs = [timeit.timeit(func, number=number) / number for _ in range(repeat)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before_size, before_blocks = _traced()
+        result = func()
+        after_size, after_blocks = _traced()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return {
+        'min_ms': round(min(runs) * 1e3, 4),
+        'mean_ms': round(sum(runs) / len(runs) * 1e3, 4),
+        'peak_kib': round(peak / 1024, 1),
+        'retained_kib': round((after_size - before_size) / 1024, 1),
+        'retained_blocks': after_blocks - before_blocks,
+    }
+
+
+def _traced():
+    stats = tracemalloc.take_snapshot().statistics('filename')
+    return sum(stat.size for stat in stats), sum(stat.count for stat in stats)
+
+
+def use_fixtures(server: FixtureServer):
+    """Point every module's upstream URLs at the fixture server."""
+    from modules.kbo.module import KBOModule
+    from modules.weather.module import WeatherModule
+
+    WeatherModule.WEATHER_URL = server.url('naver_weather.html')
+    WeatherModule.AIR_URL = server.url('naver_air.html')
+    KBOModule.KBO_BASE_URL = server.url('daum_kbo_schedule.json') + '?toDate='
+    KBOModule.KBO_RANK_URL = server.url('daum_kbo_rank.json')
+    # The fixtures are static pages, so no browser is needed to render them.
+    MODULE_LAYOUT['weather']['backend'] = 'http'
+    MODULE_LAYOUT['hyu_meal']['cafeterias'] = [
+        {**cafeteria, 'url': server.url(f"hyu_{os.path.basename(cafeteria['url'])}.html")}
+        for cafeteria in MODULE_LAYOUT['hyu_meal']['cafeterias']
+    ]
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def bench_extract(number: int) -> dict:
+    """Benchmark each extractor on the saved pages."""
+    from modules.hyu_meal.module import HYUMealModule
+    from modules.kbo.module import KBOModule
+    from modules.weather.module import WeatherModule
+
+    weather = WeatherModule()
+    weather.selector = load_selectors(os.path.join(ROOT, 'modules', 'weather', 'tag.toml'))
+    selector = weather.selector
+    weather_html = read_fixture('naver_weather.html')
+    air_html = read_fixture('naver_air.html')
+    weather_selectors = [
+        selector['location']['location'].pattern,
+        selector['alarm']['alarm'].pattern,
+        selector['weekly']['weekly_list'].pattern,
+        *(sel.pattern for sel in selector['weather'].values()),
+    ]
+    weather_soup = weather.get_soup(weather_html, weather_selectors)
+    air_soup = weather.get_soup(air_html, [selector['weather']['quick_air'].pattern])
+
+    results = {
+        'weather.get_soup': measure(
+            lambda: weather.get_soup(weather_html, weather_selectors), number
+        ),
+        'weather.get_location': measure(lambda: weather.get_location(weather_soup), number),
+        'weather.get_alarm': measure(lambda: weather.get_alarm(weather_soup), number),
+        'weather.get_weekly': measure(lambda: weather.get_weekly(weather_soup), number),
+        'weather.get_weather': measure(lambda: weather.get_weather(weather_soup), number),
+        'weather.air_get_soup': measure(
+            lambda: weather.get_soup(air_html, [selector['weather']['quick_air'].pattern]), number
+        ),
+        'weather.get_air': measure(lambda: weather.get_air(air_soup), number),
+        # These include one loopback HTTP request to the fixture server.
+        'weather.fetch_weather_page': measure(weather.fetch_weather_page, number),
+        'weather.fetch_air_page': measure(weather.fetch_air_page, number),
+    }
+    for cafeteria in MODULE_LAYOUT['hyu_meal']['cafeterias']:
+        results[f"hyu_meal.get_meal_info[{cafeteria['key']}]"] = measure(
+            lambda: HYUMealModule.get_meal_info(cafeteria), number
+        )
+    kbo = KBOModule()
+    results['kbo.get_kbo_info'] = measure(kbo.get_kbo_info, number)
+    results['kbo.get_kbo_rank'] = measure(kbo.get_kbo_rank, number)
+    weather.backend.close()
+    return results
+
+
+def bench_render(number: int) -> dict:
+    """Benchmark `render()` of every configured module."""
+    from .bench_render import load_modules
+
+    return {
+        mod_name: measure(mod_instance.render, number)
+        for mod_name, mod_instance in load_modules().items()
+    }
+
+
+def bench_http(number: int) -> dict:
+    """Benchmark `/` and each API endpoint through the Flask test client."""
+    import app as smartmirror
+
+    smartmirror.init_app('all')
+    api_modules = [name for name, config in MODULE_LAYOUT.items() if 'api_endpoint' in config]
+    for mod_name in api_modules:
+        if smartmirror.scheduler.wait(mod_name, timeout=60) is None:
+            print(f"No data for module '{mod_name}'; its endpoint returns 503.")
+    smartmirror.scheduler.stop()
+
+    client = smartmirror.app.test_client()
+    paths = ['/', '/api/all'] + [MODULE_LAYOUT[name]['api_endpoint'] for name in api_modules]
+    results = {}
+    for path in paths:
+        results[f'GET {path}'] = measure(lambda: client.get(path).close(), number)
+        results[f'GET {path} (gzip)'] = measure(
+            lambda: client.get(path, headers={'Accept-Encoding': 'gzip'}).close(), number
+        )
+    return results
+
+
+def bench_import(repeat: int = 5) -> dict:
+    """Measure the cold import time of `app` and of each module in fresh interpreters."""
+    code = 'import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)'
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, env=os.environ.copy(),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(float(output.strip().splitlines()[-1]))
+    results = {'app': {
+        'min_ms': round(min(runs) * 1e3, 4),
+        'mean_ms': round(sum(runs) / len(runs) * 1e3, 4),
+    }}
+    # What each layout module adds on top of the application, from `-X importtime`.
+    module_runs = [target_costs(import_times()) for _ in range(repeat)]
+    for target in module_runs[0]:
+        if target == 'app':
+            continue
+        costs = [costs[target] for costs in module_runs]
+        results[target] = {
+            'min_ms': round(min(costs), 4),
+            'mean_ms': round(sum(costs) / len(costs), 4),
+        }
+    return results
+
+
+def run(number: int) -> dict:
+    with FixtureServer() as server:
+        use_fixtures(server)
+        results = {
+            'extract': bench_extract(number),
+            'render': bench_render(number),
+            'http': bench_http(number),
+        }
+    results['import'] = bench_import()
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'number': number,
+        },
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a line per benchmark that got slower or larger than `threshold` allows."""
+    regressions = []
+    for group, benches in report['results'].items():
+        for bench, metrics in benches.items():
+            old = baseline['results'].get(group, {}).get(bench)
+            if old is None:
+                continue
+            for metric, floor in NOISE_FLOOR.items():
+                if metric in metrics and old.get(metric) and \
+                        metrics[metric] > old[metric] * (1 + threshold) and \
+                        metrics[metric] - old[metric] > floor:
+                    regressions.append(
+                        f'{group}/{bench}: {metric} {old[metric]} -> {metrics[metric]} '
+                        f'(+{(metrics[metric] / old[metric] - 1) * 100:.0f}%)'
+                    )
+    return regressions
+
+
+def print_report(report: dict, baseline: dict | None):
+    header = f"{'benchmark':<52} {'min (ms)':>10} {'peak (KiB)':>11}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    for group, benches in report['results'].items():
+        for bench, metrics in benches.items():
+            line = f"{group + '/' + bench:<52} {metrics['min_ms']:>10.3f} " \
+                   f"{metrics.get('peak_kib', ''):>11}"
+            old = (baseline or {}).get('results', {}).get(group, {}).get(bench)
+            if old and old.get('min_ms'):
+                line += f" {(metrics['min_ms'] / old['min_ms'] - 1) * 100:>+7.0f}%"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20, help='calls per timing run')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='write the results as the baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='exit with status 1 if a benchmark regressed against the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change reported as a regression (default: 0.25)')
+    args = parser.parse_args()
+
+    report = run(args.number)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+    print_report(report, baseline)
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f'Baseline written to {args.baseline}')
+    if args.compare:
+        if baseline is None:
+            sys.exit(f'No baseline at {args.baseline}; run with --save first.')
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
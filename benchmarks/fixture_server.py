@@ -0,0 +1,79 @@
+# benchmarks/fixture_server.py
+
+"""
+Local HTTP stand-in for the upstream sites, serving the saved fixtures.
+
+Benchmarks point the modules' upstream URLs at this server, so the whole fetch,
+parse and serve path runs offline and against the same bytes every time.
+
+Example:
+    with FixtureServer() as server:
+        url = server.url('naver_weather.html')
+"""
+
+import mimetypes
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = os.path.basename(self.path.split('?', 1)[0])
+        body = self.server.fixtures.get(name)
+        if body is None:
+            self.send_error(404)
+            return
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.send_response(200)
+        # Naver and Daum declare the charset in the header; the HYU portal does not.
+        if not name.startswith('hyu_'):
+            content_type += '; charset=utf-8'
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve every file in `fixture_dir` at `http://127.0.0.1:<port>/<file name>`."""
+
+    def __init__(self, fixture_dir: str = FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self._server = None
+        self._thread = None
+
+    def url(self, name: str) -> str:
+        """Return the URL at which the fixture file `name` is served."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/{name}'
+
+    def start(self):
+        """Load the fixtures into memory and start serving them on a free port."""
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+        self._server.daemon_threads = True
+        self._server.fixtures = {}
+        for name in os.listdir(self.fixture_dir):
+            with open(os.path.join(self.fixture_dir, name), 'rb') as file:
+                self._server.fixtures[name] = file.read()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='fixture-server', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
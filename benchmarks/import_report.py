@@ -0,0 +1,106 @@
+# benchmarks/import_report.py
+
+"""
+Report how much each part of the application costs to import.
+
+Runs a fresh interpreter with `-X importtime`, imports `app` and then every
+configured module, and reports the time each one adds, with the heaviest packages
+imported along the way. A module's cost only counts what `app` had not already
+imported.
+
+Usage:
+    python -m benchmarks.import_report [--top 15] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from config import MODULE_LAYOUT
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_targets() -> list[str]:
+    """Return the modules imported in order: the application, then each layout module."""
+    return ['app'] + [f'modules.{mod_name}' for mod_name in MODULE_LAYOUT]
+
+
+def import_times(targets: list[str] | None = None) -> list[dict]:
+    """Import `targets` in a fresh interpreter and return its `-X importtime` records.
+
+    Args:
+        targets (list[str] | None): Modules to import, in order. Defaults to
+            `import_targets()`.
+
+    Returns:
+        list[dict]: One `{name, depth, self_ms, cumulative_ms}` per imported module, in
+            the order the interpreter finished importing them.
+    """
+    targets = targets or import_targets()
+    code = '; '.join(f'import {target}' for target in targets)
+    # Startup must not touch the snapshots of a real installation.
+    env = {**os.environ, 'SMARTMIRROR_SNAPSHOT_DB': ''}
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    ).stderr
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        records.append({
+            'name': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    return records
+
+
+def target_costs(records: list[dict], targets: list[str] | None = None) -> dict[str, float]:
+    """Return the import time in milliseconds added by each of `targets`."""
+    targets = targets or import_targets()
+    costs = {}
+    for record in records:
+        if record['depth'] == 0 and record['name'] in targets:
+            costs[record['name']] = record['cumulative_ms']
+    # A target imported as a dependency of an earlier one cost nothing extra.
+    return {target: costs.get(target, 0.0) for target in targets}
+
+
+def heaviest(records: list[dict], top: int) -> list[dict]:
+    """Return the `top` packages with the highest cumulative import time."""
+    packages = [record for record in records if '.' not in record['name']]
+    return sorted(packages, key=lambda record: record['cumulative_ms'], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='heaviest packages to list')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    records = import_times()
+    costs = target_costs(records)
+    packages = heaviest(records, args.top)
+    if args.json:
+        print(json.dumps({'targets': costs, 'packages': packages}, indent=2))
+        return
+
+    print(f"{'target':<24} {'import (ms)':>12}")
+    for target, cost in costs.items():
+        print(f'{target:<24} {cost:>12.1f}')
+    print(f"{'total':<24} {sum(costs.values()):>12.1f}")
+    print()
+    print(f"{'package':<24} {'cumulative (ms)':>16} {'self (ms)':>10}")
+    for record in packages:
+        print(f"{record['name']:<24} {record['cumulative_ms']:>16.1f} {record['self_ms']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
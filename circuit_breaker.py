@@ -0,0 +1,149 @@
+# circuit_breaker.py
+
+"""
+Per-upstream circuit breakers.
+
+Every fetch from an upstream host goes through that host's breaker. After
+`failure_threshold` consecutive failures the breaker opens and further fetches fail
+at once with `CircuitOpenError` instead of waiting on a host that is down. Once
+`reset_timeout` seconds have passed, a single trial fetch is let through: success
+closes the breaker, failure opens it again for twice as long (up to
+`max_reset_timeout`).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+from metrics import CIRCUIT_EVENTS
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of contacting an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Failure counter and open/half-open/closed state for one upstream host.
+
+    Example:
+        with circuit_breakers.get('weather.naver.com').guard():
+            html = fetch_page()
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60,
+                 max_reset_timeout: float = 900):
+        """
+        Args:
+            name (str): Upstream the breaker protects (its host name).
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a trial fetch.
+            max_reset_timeout (float): Upper bound for the doubled open time after
+                failed trials.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.open_for = reset_timeout
+        self.last_error = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open' (open, but a trial fetch is allowed or running)."""
+        if self.opened_at is None:
+            return 'closed'
+        if self._trial or time.monotonic() - self.opened_at >= self.open_for:
+            return 'half-open'
+        return 'open'
+
+    @contextmanager
+    def guard(self):
+        """Run the block as one fetch from the upstream, recording its outcome.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, without running the block.
+        """
+        self.allow()
+        try:
+            yield
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+
+    def allow(self):
+        """Raise `CircuitOpenError` unless a fetch may be attempted now."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.open_for - time.monotonic()
+            if remaining <= 0 and not self._trial:
+                self._trial = True
+                return
+        CIRCUIT_EVENTS.inc(host=self.name, event='rejected')
+        raise CircuitOpenError(
+            f'{self.name} is failing ({self.last_error}); next attempt in {max(remaining, 0):.0f}s'
+        )
+
+    def record_success(self):
+        with self._lock:
+            was_open = self.opened_at is not None
+            self.failures = 0
+            self.opened_at = None
+            self.open_for = self.reset_timeout
+            self._trial = False
+        if was_open:
+            CIRCUIT_EVENTS.inc(host=self.name, event='closed')
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = f'{type(error).__name__}: {error}'
+            if self._trial:
+                # The trial failed: stay open, and for longer.
+                self.open_for = min(self.open_for * 2, self.max_reset_timeout)
+            elif self.opened_at is not None or self.failures < self.failure_threshold:
+                return
+            self.opened_at = time.monotonic()
+            self._trial = False
+        CIRCUIT_EVENTS.inc(host=self.name, event='opened')
+        print(f'Circuit for {self.name} opened for {self.open_for:.0f}s: {self.last_error}')
+
+    def as_dict(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'last_error': self.last_error,
+        }
+
+
+class CircuitBreakers:
+    """The breakers of every upstream host, created on first use."""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        """Return the breaker of `host`."""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(host, CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout,
+                ))
+        return breaker
+
+    def stats(self) -> dict:
+        """Return the state of every breaker, by host."""
+        return {host: breaker.as_dict() for host, breaker in list(self._breakers.items())}
+
+
+circuit_breakers = CircuitBreakers(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
@@ -3,9 +3,12 @@
 """
 Configuration settings for the Smart Mirror project.
 
-This file contains layout and positioning settings for modules.
+This file contains layout and positioning settings for modules, along with
+runtime settings that can be overridden through environment variables.
 """
 
+import os
+
 MODULE_LAYOUT = {
     'today': {
         'position': 'top-left',
@@ -34,6 +37,17 @@ MODULE_LAYOUT = {
         'width': '1000px',
         'refresh_interval': 3600000,
         'api_endpoint': '/api/weather-data',
+        # Page fetch backend: 'selenium' (headless Chrome) or 'http' (no browser).
+        'backend': 'selenium',
+        # Per-backend settings. Selenium browsers are started on first use and restarted
+        # after `max_page_loads` pages or once a browser's process tree exceeds `max_rss_mb`.
+        'backend_options': {
+            'selenium': {
+                'max_drivers': 2,
+                'max_page_loads': 100,
+                'max_rss_mb': 500,
+            },
+        },
         'options': {
             'font-size': '20px',
             'font-family': 'Arial, sans-serif',
@@ -46,6 +60,24 @@ MODULE_LAYOUT = {
         'height': '400px',
         'refresh_interval': 3600000,
         'api_endpoint': '/api/meal-data',
+        # Cafeterias to show: API key, menu page URL, the menu table row to read, the
+        # name shown on the mirror and how many meals of each day to show.
+        'cafeterias': [
+            {
+                'key': 'meal_bi_info',
+                'url': 'https://www.hanyang.ac.kr/web/www/re15',
+                'row': 'tr:nth-child(1)',
+                'title': '창업보육지원센터',
+                'meals': 1,
+            },
+            {
+                'key': 'meal_sc_info',
+                'url': 'https://www.hanyang.ac.kr/web/www/re11',
+                'row': 'tr:nth-child(3)',
+                'title': '교직원식당',
+                'meals': 2,
+            },
+        ],
         'options': {
             'font-size': '18px',
             'font-family': 'Arial, sans-serif',
@@ -72,3 +104,55 @@ MODULE_LAYOUT = {
     },
     # Additional module configurations can be added here.
 }
+
+# Milliseconds between two polls of /api/all by each display. Polls only transfer
+# modules whose data changed, so this can be much shorter than `refresh_interval`.
+API_POLL_INTERVAL = 60000
+
+# What `python app.py` does with module data: 'all' refreshes and serves it in one
+# process. `serve.py` runs one 'scraper' process and several 'web' workers instead.
+ROLE = os.environ.get('SMARTMIRROR_ROLE', 'all')
+
+# Production server (serve.py): port, WSGI worker processes and threads per worker.
+# Each open /api/stream connection holds one thread.
+PORT = int(os.environ.get('SMARTMIRROR_PORT', '5000'))
+WORKERS = int(os.environ.get('SMARTMIRROR_WORKERS', '2'))
+THREADS = int(os.environ.get('SMARTMIRROR_THREADS', '8'))
+# Port on which the scraper process exposes its own /metrics (0 disables it). Module
+# refresh and upstream metrics are only recorded there in production.
+SCRAPER_METRICS_PORT = int(os.environ.get('SMARTMIRROR_SCRAPER_METRICS_PORT', '5001'))
+
+# SQLite file holding each module's last good API data, served right after a restart.
+# Set SMARTMIRROR_SNAPSHOT_DB to an empty string to disable persistence.
+SNAPSHOT_DB = os.environ.get(
+    'SMARTMIRROR_SNAPSHOT_DB', os.path.join(os.path.dirname(__file__), 'data', 'snapshots.db')
+)
+
+# Upstream circuit breakers (see circuit_breaker.py): consecutive failed fetches from a
+# host before further fetches fail at once, and seconds until one is tried again.
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('SMARTMIRROR_CIRCUIT_FAILURES', '3'))
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get('SMARTMIRROR_CIRCUIT_RESET', '60'))
+
+# Directory for compiled template bytecode so cold starts skip recompiling templates.
+# Leave unset to keep compiled templates in memory only.
+TEMPLATE_CACHE_DIR = os.environ.get('SMARTMIRROR_TEMPLATE_CACHE_DIR')
+
+# Re-check template files' mtimes on every render so edits show up without a restart.
+TEMPLATE_AUTO_RELOAD = os.environ.get('SMARTMIRROR_TEMPLATE_AUTO_RELOAD', '1') == '1'
+
+# Watch this file and apply MODULE_LAYOUT edits without a restart (see config_watcher.py).
+# Only modules whose entry changed are re-created or re-rendered.
+CONFIG_RELOAD = os.environ.get('SMARTMIRROR_CONFIG_RELOAD', '1') == '1'
+
+# Opt-in profiling (see profiler.py): fraction of index/API requests and module
+# refreshes profiled with cProfile, from 0 (off) to 1. Profiles go to PROFILE_DIR and
+# only the newest PROFILE_MAX_FILES are kept.
+PROFILE_SAMPLE_RATE = float(os.environ.get('SMARTMIRROR_PROFILE_RATE', '0'))
+PROFILE_DIR = os.environ.get(
+    'SMARTMIRROR_PROFILE_DIR', os.path.join(os.path.dirname(__file__), 'data', 'profiles')
+)
+PROFILE_MAX_FILES = int(os.environ.get('SMARTMIRROR_PROFILE_MAX_FILES', '100'))
+
+# Secret for admin-only features such as `?profile=<token>` and /profiles.
+# Unset to disable them.
+ADMIN_TOKEN = os.environ.get('SMARTMIRROR_ADMIN_TOKEN') or None
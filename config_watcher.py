@@ -0,0 +1,96 @@
+# config_watcher.py
+
+"""
+Reload the module layout when config.py changes.
+
+The file is checked every `CHECK_INTERVAL` seconds. On a change it is executed in a
+fresh namespace, so the running `config` module is left alone, and its
+`MODULE_LAYOUT` is handed to a callback (see `ModuleRegistry.reconfigure`). Only the
+layout is reloaded; the other settings still need a restart.
+"""
+
+import importlib.util
+import os
+import threading
+from typing import Callable
+
+
+def load_layout(path: str) -> dict:
+    """Execute the configuration file at `path` and return its `MODULE_LAYOUT`.
+
+    Raises:
+        Exception: Whatever executing the file raises (e.g., a SyntaxError).
+    """
+    spec = importlib.util.spec_from_file_location('_reloaded_config', path)
+    config_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config_module)
+    return config_module.MODULE_LAYOUT
+
+
+class ConfigWatcher:
+    """Call `on_change` with the new module layout whenever the configuration file changes.
+
+    Example:
+        watcher = ConfigWatcher(config.__file__, on_change=registry.reconfigure)
+        watcher.start()
+    """
+
+    # Seconds between two checks of the configuration file.
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self, path: str, on_change: Callable[[dict], None]):
+        """
+        Args:
+            path (str): The configuration file to watch.
+            on_change (Callable[[dict], None]): Called from the watcher thread with the
+                reloaded `MODULE_LAYOUT`.
+        """
+        self.path = path
+        self.on_change = on_change
+        self._signature = self._stat()
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start watching in a background thread."""
+        self._stopped.clear()
+        threading.Thread(target=self._watch, name='config-watcher', daemon=True).start()
+
+    def stop(self):
+        """Stop watching after the current check."""
+        self._stopped.set()
+
+    def check(self) -> bool:
+        """Reload the layout if the file changed since the last check.
+
+        Returns:
+            bool: Whether a new layout was handed to `on_change`.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        # A broken file is reported once, then waits for the next edit.
+        self._signature = signature
+        try:
+            layout = load_layout(self.path)
+        except Exception as e:
+            print(f'Failed to reload {self.path}: {e}')
+            return False
+        if not isinstance(layout, dict):
+            print(f'Failed to reload {self.path}: MODULE_LAYOUT is not a dict')
+            return False
+        self.on_change(layout)
+        return True
+
+    def _watch(self):
+        while not self._stopped.wait(self.CHECK_INTERVAL):
+            try:
+                self.check()
+            except Exception as e:
+                print(f'Failed to apply {self.path}: {e}')
+
+    def _stat(self) -> tuple | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
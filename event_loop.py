@@ -0,0 +1,73 @@
+# event_loop.py
+
+"""
+Shared asyncio event loop for module refreshes.
+
+One daemon thread runs the loop. Coroutines from `AsyncAPIModule.api()` are awaited
+there, so their network waits overlap without holding a thread each. Synchronous
+`api()` methods are adapted with `run_sync()`, which runs them on a small thread
+pool and lets the loop await the result. `asyncio` is only imported once the loop
+starts, keeping it off the startup path.
+
+Example:
+    future = event_loop.submit(weather_module.api())
+    data = future.result(timeout=60)
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+
+class EventLoopThread:
+    """An asyncio event loop running in a background thread, started on first use."""
+
+    def __init__(self, name: str = 'event-loop', max_workers: int = 8):
+        """
+        Args:
+            name (str): Name of the loop's thread.
+            max_workers (int): Threads running synchronous calls adapted by `run_sync()`.
+        """
+        self.name = name
+        self._loop = None
+        # Threads are only started when the first synchronous call is submitted.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f'{name}-sync'
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The running `asyncio` loop, started with its thread on first access."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    import asyncio
+
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name=self.name, daemon=True
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, coroutine: Awaitable) -> Future:
+        """Schedule `coroutine` on the loop from any thread.
+
+        Returns:
+            Future: Resolves to the coroutine's result.
+        """
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def call_soon(self, callback: Callable, *args):
+        """Call `callback(*args)` on the loop's thread, from any thread."""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    async def run_sync(self, func: Callable, *args) -> Any:
+        """Await `func(*args)` run on the thread pool, so it doesn't block the loop."""
+        return await self.loop.run_in_executor(self._executor, func, *args)
+
+
+event_loop = EventLoopThread()
@@ -0,0 +1,59 @@
+# fetcher.py
+
+"""
+Concurrent upstream fetching for API modules.
+
+Modules usually need several independent upstream requests per refresh. `fetch_all()`
+runs them in parallel on a shared thread pool under a single deadline, so the latency
+of a module's `api()` approaches that of its slowest request instead of their sum.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+
+# Shared by all modules. Tasks must not call fetch_all() themselves, or nested waits
+# could exhaust the pool.
+MAX_WORKERS = 8
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='fetch')
+
+
+class FetchTimeout(TimeoutError):
+    """Raised when some fetches did not finish before the deadline."""
+
+
+def fetch_all(tasks: dict[str, Callable[[], Any]], deadline: float,
+              return_exceptions: bool = False) -> dict[str, Any]:
+    """Run independent fetches in parallel and collect their results.
+
+    Args:
+        tasks (dict[str, Callable[[], Any]]): Mapping of result key to a zero-argument
+            callable performing one upstream fetch.
+        deadline (float): Seconds to wait for all tasks to finish.
+        return_exceptions (bool): Whether to return the exception of a failed task, or a
+            `FetchTimeout` for one that missed the deadline, as its result instead of
+            raising, so the other results are kept.
+
+    Returns:
+        dict[str, Any]: Mapping of result key to the value returned by its task.
+
+    Raises:
+        FetchTimeout: If any task is still running when the deadline passes.
+        Exception: The first exception raised by a task, in `tasks` order.
+    """
+    futures = {key: _executor.submit(func) for key, func in tasks.items()}
+    _, not_done = wait(futures.values(), timeout=deadline)
+    for future in not_done:
+        future.cancel()
+    if not_done and not return_exceptions:
+        pending = ', '.join(key for key, future in futures.items() if future in not_done)
+        raise FetchTimeout(f'Fetch deadline of {deadline}s exceeded by: {pending}')
+    results = {}
+    for key, future in futures.items():
+        if future in not_done:
+            results[key] = FetchTimeout(f'Fetch deadline of {deadline}s exceeded by: {key}')
+        elif return_exceptions and future.exception() is not None:
+            results[key] = future.exception()
+        else:
+            results[key] = future.result()
+    return results
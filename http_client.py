@@ -0,0 +1,246 @@
+# http_client.py
+
+"""
+Shared HTTP client for module upstream requests.
+
+All modules fetch through one `requests.Session` so that connections are kept alive
+per host, every request has a connect/read timeout, transient failures are retried
+with bounded backoff, unchanged pages are revalidated with conditional GETs, and a
+host that keeps failing is skipped by its circuit breaker. Identical GETs made at
+the same time share a single upstream request.
+
+`requests` is imported when the first request is made rather than at startup.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from urllib.parse import urlsplit
+
+from circuit_breaker import circuit_breakers
+from metrics import CACHE_REQUESTS, UPSTREAM_BYTES, UPSTREAM_ERRORS, UPSTREAM_SECONDS
+from singleflight import SingleFlight
+
+
+@cache
+def bounded_retry_class():
+    """Return the urllib3 `Retry` subclass used by the client, importing urllib3 once."""
+    from urllib3.util.retry import Retry
+
+    class BoundedRetry(Retry):
+        """Retry policy whose exponential backoff never sleeps longer than a few seconds."""
+
+        DEFAULT_BACKOFF_MAX = 4
+
+    return BoundedRetry
+
+
+def _endpoint(url: str) -> str:
+    """Return `url` without its query string and fragment."""
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}{parts.path}'
+
+
+class HostStats:
+    """Request counters for a single upstream host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.not_modified = 0
+        self.connections = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'not_modified': self.not_modified,
+            'new_connections': self.connections,
+            'reused_connections': max(self.requests - self.errors - self.connections, 0),
+        }
+
+
+class HTTPClient:
+    """Pooled HTTP client with timeouts, retries and conditional GETs.
+
+    Example:
+        response = http_client.get('https://sports.daum.net/...')
+        data = response.json()
+    """
+
+    DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+    # (connect, read) timeouts in seconds.
+    DEFAULT_TIMEOUT = (3.05, 10)
+    # Seconds a caller waits for an identical request already in flight; longer than
+    # a request with all of its retries takes.
+    JOIN_TIMEOUT = 60
+    # Endpoints whose latest response is kept for revalidation, least recently used
+    # dropped first.
+    MAX_VALIDATED = 32
+
+    def __init__(self, pool_maxsize: int = 4, retries: int = 2, backoff_factor: float = 0.5):
+        """
+        Args:
+            pool_maxsize (int): Keep-alive connections kept per host.
+            retries (int): Retries for connection errors, read errors and 5xx/429 responses.
+            backoff_factor (float): Base delay of the exponential backoff between retries.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.adapter = None
+        self._session = None
+        # Endpoint (URL without its query) -> (URL, response) of the latest validated GET.
+        # Keyed per endpoint, so URLs that differ only by query (e.g., a date) replace
+        # each other instead of piling up.
+        self._validated: OrderedDict[str, tuple] = OrderedDict()
+        self._stats: dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight('upstream_http', timeout=self.JOIN_TIMEOUT)
+
+    @property
+    def session(self):
+        """The shared `requests.Session`, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        retry = bounded_retry_class()(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.headers.update(self.DEFAULT_HEADERS)
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        return session
+
+    def get(self, url: str, headers: dict | None = None, timeout=None,
+            revalidate: bool = True):
+        """Send a GET request through the shared session.
+
+        When a previous 200 response for `url` carried an ETag or Last-Modified header,
+        the request is made conditional and a 304 answer returns that cached response.
+        Callers asking for the same URL and headers while a request is in flight wait
+        for it and get the same response object, so it must not be modified.
+
+        Args:
+            url (str): URL to fetch.
+            headers (dict | None): Extra request headers.
+            timeout: Timeout in seconds, or a (connect, read) tuple. Defaults to
+                `DEFAULT_TIMEOUT`.
+            revalidate (bool): Whether to use and store validators for `url`.
+
+        Returns:
+            requests.Response: The response, or the cached response on a 304.
+
+        Raises:
+            requests.RequestException: If the request fails after all retries.
+            CircuitOpenError: If the host failed repeatedly and is not retried yet.
+        """
+        key = (url, tuple(sorted((headers or {}).items())), revalidate)
+        return self._flights.do(key, lambda: self._get(url, headers, timeout, revalidate))
+
+    def _get(self, url: str, headers: dict | None, timeout, revalidate: bool):
+        import requests
+
+        session = self.session
+        request_headers = dict(headers or {})
+        cached = self._cached_response(url) if revalidate else None
+        if cached is not None:
+            if 'ETag' in cached.headers:
+                request_headers['If-None-Match'] = cached.headers['ETag']
+            if 'Last-Modified' in cached.headers:
+                request_headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+        host = urlsplit(url).netloc
+        breaker = circuit_breakers.get(host)
+        breaker.allow()
+        start = time.perf_counter()
+        try:
+            response = session.get(
+                url, headers=request_headers, timeout=timeout or self.DEFAULT_TIMEOUT
+            )
+        except Exception as e:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - start, host=host, client='http')
+            UPSTREAM_ERRORS.inc(host=host, client='http')
+            self._record(url, host, error=True)
+            breaker.record_failure(e)
+            raise
+        UPSTREAM_SECONDS.observe(time.perf_counter() - start, host=host, client='http')
+        if response.status_code >= 500:
+            breaker.record_failure(requests.HTTPError(f'{response.status_code} {response.reason}'))
+        else:
+            breaker.record_success()
+
+        if cached is not None:
+            CACHE_REQUESTS.inc(
+                cache='upstream_revalidation',
+                result='hit' if response.status_code == 304 else 'miss',
+            )
+        if response.status_code == 304 and cached is not None:
+            self._record(url, host, not_modified=True)
+            return cached
+        UPSTREAM_BYTES.observe(len(response.content), host=host, client='http')
+        self._record(url, host, size=len(response.content))
+        if revalidate and response.status_code == 200 and (
+            'ETag' in response.headers or 'Last-Modified' in response.headers
+        ):
+            self._store_response(url, response)
+        return response
+
+    def _cached_response(self, url: str):
+        with self._lock:
+            entry = self._validated.get(_endpoint(url))
+            if entry is None or entry[0] != url:
+                return None
+            self._validated.move_to_end(_endpoint(url))
+            return entry[1]
+
+    def _store_response(self, url: str, response):
+        with self._lock:
+            self._validated[_endpoint(url)] = (url, response)
+            self._validated.move_to_end(_endpoint(url))
+            while len(self._validated) > self.MAX_VALIDATED:
+                self._validated.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return per-host request counters.
+
+        Returns:
+            dict: Mapping of host to its requests, errors, bytes, 304 hits and
+                new/reused connection counts.
+        """
+        with self._lock:
+            return {host: host_stats.as_dict() for host, host_stats in self._stats.items()}
+
+    def _record(self, url: str, host: str, size: int = 0, not_modified: bool = False,
+                error: bool = False):
+        try:
+            connections = self.adapter.poolmanager.connection_from_url(url).num_connections
+        except Exception:
+            connections = None
+        with self._lock:
+            host_stats = self._stats.setdefault(host, HostStats())
+            host_stats.requests += 1
+            host_stats.bytes += size
+            host_stats.not_modified += not_modified
+            host_stats.errors += error
+            if connections is not None:
+                host_stats.connections = max(host_stats.connections, connections)
+
+
+http_client = HTTPClient()
@@ -0,0 +1,208 @@
+# metrics.py
+
+"""
+In-process metrics exposed in the Prometheus text format.
+
+Module loads, `render()` and `api()` calls, upstream fetches, parse steps and caches
+record into the counters and histograms defined here; `/metrics` renders them.
+Recording a sample only takes a lock and a few additions, so it is safe on hot paths.
+
+Example:
+    with timed(MODULE_SECONDS, MODULE_ERRORS, module='weather', stage='api'):
+        data = weather_module.api()
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+# Upper bounds in seconds, from cached renders (~50us) up to slow browser page loads.
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+# Upper bounds in bytes, from small JSON answers up to full portal pages.
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f'{self.name}: missing label {e}') from None
+
+    def _format_labels(self, key: tuple, extra: str = '') -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {_escape(self.documentation)}',
+                 f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, one per label combination."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self, key, value):
+        return [f'{self.name}{self._format_labels(key)} {_format_value(value)}']
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, one per label combination."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        # Values above the last bound land in the implicit +Inf bucket.
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _samples(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = 'le="+Inf"' if bound == float('inf') else f'le="{_format_value(bound)}"'
+            lines.append(f'{self.name}_bucket{self._format_labels(key, le)} {cumulative}')
+        lines.append(f'{self.name}_sum{self._format_labels(key)} {_format_value(total)}')
+        lines.append(f'{self.name}_count{self._format_labels(key)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at `/metrics`."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            registered = list(self._metrics.values())
+        lines = []
+        for metric in registered:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+@contextmanager
+def timed(histogram: Histogram, errors: Counter | None = None, **labels):
+    """Observe the duration of the block in `histogram`, counting exceptions in `errors`.
+
+    Exceptions are re-raised; their duration is recorded like any other call.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        if errors is not None:
+            errors.inc(**labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+MODULE_SECONDS = metrics.histogram(
+    'smartmirror_module_seconds',
+    'Duration of module loads, render() and api() calls.',
+    ('module', 'stage'),
+)
+MODULE_ERRORS = metrics.counter(
+    'smartmirror_module_errors_total',
+    'Module loads, render() and api() calls that raised.',
+    ('module', 'stage'),
+)
+UPSTREAM_SECONDS = metrics.histogram(
+    'smartmirror_upstream_fetch_seconds',
+    'Duration of upstream fetches, including retries and browser page loads.',
+    ('host', 'client'),
+)
+UPSTREAM_ERRORS = metrics.counter(
+    'smartmirror_upstream_errors_total',
+    'Upstream fetches that failed.',
+    ('host', 'client'),
+)
+UPSTREAM_BYTES = metrics.histogram(
+    'smartmirror_upstream_response_bytes',
+    'Size of upstream response bodies.',
+    ('host', 'client'),
+    buckets=SIZE_BUCKETS,
+)
+PARSE_SECONDS = metrics.histogram(
+    'smartmirror_parse_seconds',
+    'Duration of parsing and extraction steps on upstream responses.',
+    ('module', 'step'),
+)
+CIRCUIT_EVENTS = metrics.counter(
+    'smartmirror_circuit_breaker_events_total',
+    'Upstream circuit breakers opening, closing and rejecting fetches.',
+    ('host', 'event'),
+)
+CACHE_REQUESTS = metrics.counter(
+    'smartmirror_cache_requests_total',
+    'Cache lookups by result (hit or miss).',
+    ('cache', 'result'),
+)
@@ -1,16 +1,70 @@
 # module.py
 
+import os
 from abc import ABC, abstractmethod
 
-from jinja2 import Environment, Template
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2 import TemplateNotFound
+
+from config import TEMPLATE_AUTO_RELOAD, TEMPLATE_CACHE_DIR
+
+
+class TemplateDirLoader(BaseLoader):
+    """Jinja loader that resolves absolute template paths.
+
+    Each template directory gets its own `FileSystemLoader`, so compiled templates are
+    cached per path and invalidated when the file's mtime changes.
+    """
+
+    def __init__(self):
+        self._loaders: dict[str, FileSystemLoader] = {}
+
+    def get_source(self, environment, template):
+        directory, filename = os.path.split(template)
+        loader = self._loaders.get(directory)
+        if loader is None:
+            loader = self._loaders.setdefault(directory, FileSystemLoader(directory))
+        return loader.get_source(environment, filename)
+
+
+def create_template_environment():
+    """Create the Jinja environment shared by all modules.
+
+    Returns:
+        Environment: Environment with an in-memory template cache and, when
+            `TEMPLATE_CACHE_DIR` is set, an on-disk bytecode cache.
+    """
+    bytecode_cache = None
+    if TEMPLATE_CACHE_DIR:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+    return Environment(
+        loader=TemplateDirLoader(),
+        bytecode_cache=bytecode_cache,
+        auto_reload=TEMPLATE_AUTO_RELOAD,
+    )
+
+
+template_environment = create_template_environment()
 
 
 class BaseModule(ABC):
     """Abstract base class for modules.
 
     All modules should inherit from this class and implement the required methods.
+
+    Attributes:
+        init_keys (tuple[str, ...]): Keys of the module's `MODULE_LAYOUT` entry that are
+            only read in `__init__`. When a config reload changes one of them, the module
+            is instantiated again; other changes only re-render it.
+        data_keys (tuple[str, ...]): Keys of the module's `MODULE_LAYOUT` entry that
+            `api()` reads. When a config reload changes one of them, the module's data
+            is refreshed right away.
     """
 
+    init_keys: tuple[str, ...] = ()
+    data_keys: tuple[str, ...] = ()
+
     @property
     @abstractmethod
     def name(self):
@@ -40,10 +94,32 @@ class BaseModule(ABC):
         """
         pass
 
+    def status(self):
+        """Return runtime state of the module for monitoring.
+
+        This method can be overridden by subclasses that manage resources worth
+        watching (e.g., browser processes). By default, it returns an empty dict.
+
+        Returns:
+            dict: Module state.
+        """
+        return {}
+
+    def close(self):
+        """Release the module's resources before the instance is discarded.
+
+        This method can be overridden by subclasses that hold resources such as
+        browsers. By default, it performs no action.
+        """
+        pass
+
     def render_template(self, template_path: str, **context) -> str:
         """
         Renders an HTML template file with the provided context and returns the result as a string.
 
+        Templates are compiled once through the shared `template_environment` and reused
+        until the file changes on disk.
+
         Args:
             template_path (str): The full file path to the HTML template
                 (e.g., `'templates/index.html'`).
@@ -57,9 +133,10 @@ class BaseModule(ABC):
             FileNotFoundError: If the specified template file does not exist.
             IOError: If there is an issue reading the file.
         """
-        with open(template_path, 'r', encoding='utf-8') as file:
-            template_content = file.read()
-        template = Template(template_content)
+        try:
+            template = template_environment.get_template(os.path.abspath(template_path))
+        except TemplateNotFound as e:
+            raise FileNotFoundError(f'Template not found: {template_path}') from e
         rendered_html = template.render(context)
         return rendered_html
 
@@ -81,3 +158,37 @@ class APIModule(BaseModule):
             dict: API data for the module.
         """
         pass
+
+    def next_refresh(self, default: float) -> float:
+        """Return how many seconds to wait before calling `api()` again.
+
+        This method can be overridden by modules whose upstream data changes on a
+        known schedule (e.g., live games). By default, it returns `default`, the
+        configured refresh interval.
+
+        Args:
+            default (float): Configured refresh interval in seconds.
+
+        Returns:
+            float: Seconds until the next background refresh.
+        """
+        return default
+
+
+class AsyncAPIModule(APIModule):
+    """Abstract base class for API modules whose `api` method is a coroutine.
+
+    The scheduler awaits `api()` on the shared event loop (see event_loop.py), so the
+    network waits of every async module overlap on a single thread. `api()` must only
+    await non-blocking I/O; blocking work belongs in `await event_loop.run_sync(func)`,
+    or it stalls every other async module.
+    """
+
+    @abstractmethod
+    async def api(self):
+        """Return API data for the module.
+
+        Returns:
+            dict: API data for the module.
+        """
+        pass
@@ -0,0 +1,12 @@
+// modules/anti_burnin/static/module.js
+
+SmartMirror.register('anti_burnin', config => {
+    const container = document.querySelector('.container');
+    function applyAntiBurnInEffect() {
+        const shiftX = (Math.random() * config.max_step * -1) + 'px';
+        const shiftY = (Math.random() * config.max_step * -1) + 'px';
+
+        container.style.transform = `translate(${shiftX}, ${shiftY})`;
+    }
+    setInterval(applyAntiBurnInEffect, config.refresh_interval);
+});
@@ -0,0 +1,10 @@
+// modules/clock/static/module.js
+
+SmartMirror.register('clock', config => {
+    const clock = document.getElementById('clock-time');
+    function updateClock() {
+        clock.innerText = formatTime(config.time_format, new Date());
+    }
+    updateClock();
+    setInterval(updateClock, config.refresh_interval);
+});
@@ -2,17 +2,41 @@
 
 import os
 import re
+from datetime import datetime
+from functools import partial
 
-import requests
-from bs4 import BeautifulSoup
+from pytz import timezone
 
 from module import APIModule
 from config import MODULE_LAYOUT
+from fetcher import fetch_all
+from http_client import http_client
+from metrics import CACHE_REQUESTS, PARSE_SECONDS, timed
+from selector import parse_html
 
 
 class HYUMealModule(APIModule):
     """Module that displays Hanyang University's meal with dynamic updates."""
 
+    # Seconds allowed for fetching every cafeteria in one api() call.
+    FETCH_DEADLINE = 15
+    MENU_ID = '_foodView_WAR_foodportlet_tab_2'
+    MENU_TABLE_SELECTOR = f'#{MENU_ID} > div.box.tables-board-wrap > table > tbody'
+    # Used when MODULE_LAYOUT['hyu_meal'] does not list its own cafeterias.
+    DEFAULT_CAFETERIAS = [
+        {'key': 'meal_bi_info', 'url': 'https://www.hanyang.ac.kr/web/www/re15',
+         'row': 'tr:nth-child(1)', 'title': '창업보육지원센터', 'meals': 1},
+        {'key': 'meal_sc_info', 'url': 'https://www.hanyang.ac.kr/web/www/re11',
+         'row': 'tr:nth-child(3)', 'title': '교직원식당', 'meals': 2},
+    ]
+    tag_rex = re.compile(r'^\[[^]]+\]\s*')
+    data_keys = ('cafeterias',)
+
+    def __init__(self):
+        self.tz = timezone('Asia/Seoul')
+        # Cafeteria key -> (day as YYYYMMDD, cafeteria settings, menu rows).
+        self.cache: dict[str, tuple[str, dict, list]] = {}
+
     @property
     def name(self):
         """Get the unique name of the module.
@@ -33,10 +57,20 @@ class HYUMealModule(APIModule):
         refresh_interval = meal_config.get('refresh_interval', 3600000)
         options = meal_config.get('options', {})
         style = ' '.join(f'{key}: {value};' for key, value in options.items())
+        # One row per meal shown, headed by the cafeteria's name.
+        cafeterias = [
+            {
+                'key': cafeteria['key'],
+                'title': cafeteria.get('title', cafeteria['key']),
+                'meals': max(int(cafeteria.get('meals', 1)), 1),
+            }
+            for cafeteria in meal_config.get('cafeterias', self.DEFAULT_CAFETERIAS)
+        ]
         return self.render_template(
             f'{os.path.dirname(os.path.abspath(__file__))}/templates/base.html',
             style=style,
-            refresh_interval=refresh_interval
+            refresh_interval=refresh_interval,
+            cafeterias=cafeterias,
         )
 
     def api(self):
@@ -45,72 +79,90 @@ class HYUMealModule(APIModule):
         Modules that expose backend API endpoints must implement this method
         to return a dictionary containing the API data.
 
+        Each cafeteria's menu is cached for the calendar day (Asia/Seoul), so the
+        upstream is requested at most once per cafeteria per day. Cafeterias are
+        fetched independently: one that fails shows its last menu, if any, while the
+        others are still updated and cached.
+
         Returns:
             dict: API data for the module.
+
+        Raises:
+            Exception: If every cafeteria failed and none has a menu to show, so the
+                last good snapshot keeps being served.
         """
-        meal_bi_info = self.get_meal_bi_info()
-        meal_sc_info = self.get_meal_sc_info()
-        
-        return {
-            'meal_bi_info': meal_bi_info,
-            'meal_sc_info': meal_sc_info,
-        }
-
-    @staticmethod
-    def get_meal_bi_info():
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        try:
-            response = requests.get('https://www.hanyang.ac.kr/web/www/re15', headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            meal_section = soup.select_one(
-                '#_foodView_WAR_foodportlet_tab_2 > div.box.tables-board-wrap > '
-                'table > tbody > tr:nth-child(1)'
-            )
-            
-            if meal_section:
-                meal_data = []
-                cols = meal_section.find_all('td')
-                for col_section in cols[1:-1]:
-                    col_group = col_section.find_all('li')
-                    meal_list = [
-                        re.sub(r'^\[[^]]+\]\s*', '', col.get_text(strip=True))
-                        for col in col_group
-                    ]
-                    meal_data.append(meal_list)
-                return meal_data
-            else:
-                return []
-        except Exception as e:
-            print('Meal BI Info Error:', e)
-            return []
-
-    @staticmethod
-    def get_meal_sc_info():
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        try:
-            response = requests.get('https://www.hanyang.ac.kr/web/www/re11', headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            meal_section = soup.select_one(
-                '#_foodView_WAR_foodportlet_tab_2 > div.box.tables-board-wrap > '
-                'table > tbody > tr:nth-child(3)'
-            )
-            
-            if meal_section:
-                meal_data = []
-                cols = meal_section.find_all('td')
-                for col_section in cols[1:-1]:
-                    col_group = col_section.find_all('li')
-                    meal_list = [
-                        re.sub(r'^\[[^]]+\]\s*', '', col.get_text(strip=True))
-                        for col in col_group
-                    ]
-                    meal_data.append(meal_list)
-                return meal_data
+        today = datetime.now(self.tz).strftime('%Y%m%d')
+        cafeterias = MODULE_LAYOUT.get(self.name, {}).get('cafeterias', self.DEFAULT_CAFETERIAS)
+        result = {}
+        missing = {}
+        for cafeteria in cafeterias:
+            cached = self.cache.get(cafeteria['key'])
+            if cached is not None and cached[0] == today and cached[1] == cafeteria:
+                CACHE_REQUESTS.inc(cache='hyu_meal_day', result='hit')
+                result[cafeteria['key']] = cached[2]
             else:
-                return []
-        except Exception as e:
-            print('Meal SC Info Error:', e)
-            return []
+                CACHE_REQUESTS.inc(cache='hyu_meal_day', result='miss')
+                missing[cafeteria['key']] = partial(self.get_meal_info, cafeteria)
+        fetched = fetch_all(missing, deadline=self.FETCH_DEADLINE, return_exceptions=True)
+        errors = []
+        for cafeteria in cafeterias:
+            key = cafeteria['key']
+            if key not in fetched:
+                continue
+            meal_data = fetched[key]
+            if isinstance(meal_data, Exception):
+                print(f"HYU Meal Error ({key}):", meal_data)
+                errors.append(meal_data)
+                cached = self.cache.get(key)
+                # The menu table covers the whole week, so an older copy is still useful.
+                meal_data = cached[2] if cached is not None and cached[1] == cafeteria else []
+            elif meal_data:
+                # Empty menus are not cached, so the next refresh retries them.
+                self.cache[key] = (today, cafeteria, meal_data)
+            result[key] = meal_data
+        if errors and not any(result.values()):
+            raise errors[0]
+        return {cafeteria['key']: result[cafeteria['key']] for cafeteria in cafeterias}
+
+    @classmethod
+    def get_meal_info(cls, cafeteria):
+        """Fetch one cafeteria's weekly menu row.
+
+        Args:
+            cafeteria (dict): Cafeteria settings with its `key`, `url` and `row` selector.
+
+        Returns:
+            list[list[str]]: Meals for each weekday, or an empty list if the page has
+                no menu row.
+
+        Raises:
+            Exception: If the page can't be fetched.
+        """
+        response = http_client.get(cafeteria['url'])
+        response.raise_for_status()
+        with timed(PARSE_SECONDS, module='hyu_meal', step='menu_table'):
+            # Only the menu table is parsed; the rest of the portal page is skipped.
+            soup = parse_html(response.content, only_ids=[cls.MENU_ID])
+            try:
+                meal_section = soup.select_one(
+                    f'{cls.MENU_TABLE_SELECTOR} > {cafeteria["row"]}'
+                )
+
+                if meal_section:
+                    meal_data = []
+                    cols = meal_section.find_all('td')
+                    for col_section in cols[1:-1]:
+                        col_group = col_section.find_all('li')
+                        meal_list = [
+                            cls.tag_rex.sub('', col.get_text(strip=True))
+                            for col in col_group
+                        ]
+                        meal_data.append(meal_list)
+                    return meal_data
+                else:
+                    return []
+            finally:
+                soup.decompose()
 
 
 def get_module():
@@ -0,0 +1,17 @@
+// modules/hyu_meal/static/module.js
+
+// Each cafeteria in the data fills its rows, one row per meal of the day.
+function updateMealData(data) {
+    Object.entries(data).forEach(([key, days]) => {
+        document.querySelectorAll(`.hyu-meal-row[data-key="${key}"]`).forEach(row => {
+            const meal = Number(row.dataset.meal);
+            row.querySelectorAll('td:not(.hyu-meal-title)').forEach(cell => cell.remove());
+            days.forEach(day => {
+                const cell = document.createElement('td');
+                cell.textContent = day[meal] || '';
+                row.appendChild(cell);
+            });
+        });
+    });
+}
+SmartMirror.subscribe('hyu_meal', updateMealData);
@@ -1,13 +1,15 @@
 # modules/today.py
 
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
-import requests
 from pytz import timezone
 
 from module import APIModule
 from config import MODULE_LAYOUT
+from fetcher import fetch_all
+from http_client import http_client
+from metrics import PARSE_SECONDS, timed
 
 
 class KBOModule(APIModule):
@@ -17,6 +19,22 @@ class KBOModule(APIModule):
         'https://sports.daum.net/prx/hermes/api/game/schedule.json?leagueCode=kbo&toDate='
     )
     KBO_RANK_URL = 'https://sports.daum.net/prx/hermes/api/team/rank.json?leagueCode=kbo'
+    # Seconds allowed for fetching the schedule and the rank in one api() call.
+    FETCH_DEADLINE = 15
+    # Seconds between refreshes while a game is being played or after a failed fetch.
+    LIVE_INTERVAL = 60
+    # Longest wait between two refreshes, so schedule changes are eventually noticed.
+    MAX_IDLE_INTERVAL = 6 * 60 * 60
+    # Game states after which the score no longer changes.
+    FINISHED_STATUSES = ('END', 'CANCEL', 'POSTPONE', 'SUSPENDED')
+
+    def __init__(self):
+        self.tz = timezone('Asia/Seoul')
+        self.games: list[dict] = []
+        self.rank: list[dict] = []
+        # Games that had already ended when the rank table was last fetched.
+        self.ranked_games: set = set()
+        self.last_error = None
 
     @property
     def name(self):
@@ -41,8 +59,7 @@ class KBOModule(APIModule):
         return self.render_template(
             f'{os.path.dirname(os.path.abspath(__file__))}/templates/base.html',
             style=style,
-            refresh_interval=refresh_interval,
-            KBO_info=self.api()
+            refresh_interval=refresh_interval
         )
 
     def api(self):
@@ -51,30 +68,117 @@ class KBOModule(APIModule):
         Modules that expose backend API endpoints must implement this method
         to return a dictionary containing the API data.
 
+        A failed schedule fetch raises, so the last good data keeps being served.
+
         Returns:
             dict: API data for the module.
+
+        Raises:
+            Exception: If the schedule (or, on the first call, the rank) can't be fetched.
+        """
+        self.last_error = None
+        try:
+            if not self.rank:
+                # Nothing cached yet: fetch the schedule and the rank in parallel.
+                result = fetch_all({
+                    'score': self.get_kbo_info,
+                    'rank': self.get_kbo_rank,
+                }, deadline=self.FETCH_DEADLINE)
+                self.games, self.rank = result['score'], result['rank']
+                self.ranked_games = self.ended_games(self.games)
+                return result
+            self.games = self.get_kbo_info()
+        except Exception as e:
+            self.last_error = e
+            raise
+        # The standings only change when a game ends, so refetch them only then.
+        ended_games = self.ended_games(self.games)
+        if ended_games - self.ranked_games:
+            try:
+                self.rank = self.get_kbo_rank()
+                self.ranked_games = ended_games
+            except Exception as e:
+                # The scores are fresh; keep the previous standings until the next refresh.
+                print('KBO Rank Error:', e)
+                self.last_error = e
+        return {
+            'score': self.games,
+            'rank': self.rank,
+        }
+
+    def next_refresh(self, default):
+        """Return the seconds until the next upstream fetch, based on the games' state.
+
+        - While a game is being played, or should have started: every `LIVE_INTERVAL`.
+        - Before today's games: at the earliest start time.
+        - Once every game is over, or on days without games: at the next noon, when
+          the schedule switches to the new day's games.
+
+        Args:
+            default (float): Configured refresh interval in seconds (unused).
+
+        Returns:
+            float: Seconds until the next background refresh.
         """
+        if self.last_error is not None:
+            return self.LIVE_INTERVAL
+        now = datetime.now(self.tz)
+        next_start = None
+        for game in self.games:
+            status = game.get('game_status')
+            if status == 'PLAY':
+                return self.LIVE_INTERVAL
+            if status in self.FINISHED_STATUSES:
+                continue
+            start = self.game_start(game)
+            if start is None or start <= now:
+                return self.LIVE_INTERVAL
+            next_start = start if next_start is None else min(next_start, start)
+
+        if next_start is None:
+            next_start = now.replace(hour=12, minute=0, second=0, microsecond=0)
+            if next_start <= now:
+                next_start += timedelta(days=1)
+        return min((next_start - now).total_seconds(), self.MAX_IDLE_INTERVAL)
+
+    def game_start(self, game):
+        """Return the scheduled start of a game as an aware datetime, or None."""
+        try:
+            start = datetime.strptime(f"{game['start_date']}{game['start_time']}", '%Y%m%d%H%M')
+        except (KeyError, TypeError, ValueError):
+            return None
+        return self.tz.localize(start)
+
+    @staticmethod
+    def ended_games(games):
         return {
-            'score': self.get_kbo_info(),
-            'rank': self.get_kbo_rank(),
+            (game.get('start_date'), game.get('start_time'), game.get('away_team'),
+             game.get('home_team'))
+            for game in games if game.get('game_status') == 'END'
         }
 
     def get_kbo_info(self):
-        now = datetime.now(timezone('Asia/Seoul'))
+        now = datetime.now(self.tz)
         noon = now.replace(hour=12, minute=0, second=0, microsecond=0)
 
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        try:
-            response = requests.get(f'{self.KBO_BASE_URL}{now.strftime("%Y%m%d")}', headers=headers)
-            data = response.json()['schedule']
+        response = http_client.get(f'{self.KBO_BASE_URL}{now.strftime("%Y%m%d")}')
+        response.raise_for_status()
+        with timed(PARSE_SECONDS, module='kbo', step='schedule'):
+            # Off-season days come back without a schedule.
+            data = response.json().get('schedule') or {}
             keys = sorted(
                 (k for k in data if k.isdigit()), 
                 reverse=True
             )
-            if (now >= noon) or (now.strftime('%Y%m%d') >= keys[0]):
+            if not keys:
+                games = []
+            elif (now >= noon) or (now.strftime('%Y%m%d') >= keys[0]):
                 games = data[keys[0]]
-            else:
+            elif len(keys) > 1:
                 games = data[keys[1]]
+            else:
+                # Only the upcoming game day is listed; there is nothing to show this morning.
+                games = []
             result = []
             for game in games:
                 game_data = {
@@ -97,15 +201,12 @@ class KBOModule(APIModule):
                     'lose_pitcher': game.get('losePitcher'),
                 }
                 result.append(game_data)
-            return result
-        except Exception as e:
-            print('KBO Info Error:', e)
-            return []
+        return result
 
     def get_kbo_rank(self):
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        try:
-            response = requests.get(self.KBO_RANK_URL, headers=headers)
+        response = http_client.get(self.KBO_RANK_URL)
+        response.raise_for_status()
+        with timed(PARSE_SECONDS, module='kbo', step='rank'):
             data = response.json()['list']
             result = []
             for game in data:
@@ -123,10 +224,7 @@ class KBOModule(APIModule):
                     'streak': rank.get('streak'),
                 }
                 result.append(rank_data)
-            return result
-        except Exception as e:
-            print('KBO Info Error:', e)
-            return []
+        return result
 
 def get_module():
     """Factory function to create and return an instance of KBOModule.
@@ -0,0 +1,135 @@
+// modules/kbo/static/module.js
+
+function formatedDate(dateStr) {
+    const year = dateStr.slice(0, 4);
+    const month = dateStr.slice(4, 6);
+    const day = dateStr.slice(6, 8);
+
+    const date = new Date(`${year}-${month}-${day}`);
+    const weekdays = ['일', '월', '화', '수', '목', '금', '토'];
+    const weekdayKorean = weekdays[date.getDay()];
+
+    return `${month}월 ${day}일 (${weekdayKorean})`;
+}
+function updateKBOData(data) {
+    // Rank Board
+    const rankBoard = document.getElementById('kbo-rank-board');
+    const rank_data = data['rank']
+    rankBoard.innerHTML = 
+    `<tr>
+        <th>순위</th>
+        <th colspan=2>팀</th>
+        <th>경기</th>
+        <th>승</th>
+        <th>무</th>
+        <th>패</th>
+        <th>승률</th>
+        <th>게임차</th>
+        <th>연속</th>
+    </tr>`;
+    rank_data.forEach(team => {
+        rankBoard.innerHTML += 
+        `<tr>
+            <td>${team['rank']}</td>
+            <td><img src="${team['team_img']}" style="width: 30px;"/></td>
+            <td>${team['team_name']}</td>
+            <td>${team['game']}</td>
+            <td>${team['win']}</td>
+            <td>${team['draw']}</td>
+            <td>${team['loss']}</td>
+            <td>${(team['wpct']*100).toFixed(1)}%</td>
+            <td>${team['gb']}</td>
+            <td>${team['streak']}</td>
+        </tr>`
+    });
+
+    // Score Board
+    const scoreBoard = document.getElementById('kbo-score-board');
+    const score_data = data['score']
+    if (score_data.length === 0) {
+        // Off-season, or the morning before the day's schedule is out.
+        scoreBoard.innerHTML = `<tr><td colspan=9>오늘은 경기가 없습니다</td></tr>`;
+    } else {
+        scoreBoard.innerHTML = 
+        `<tr>
+            <th colspan=9>${formatedDate(score_data[0]['start_date'])}</th>
+        </tr>`;
+    }
+
+
+    const gameWlt = {'W': '승', 'L': '패', 'D': '무', null: ''};
+
+    score_data.forEach(game => {
+        scoreBoard.innerHTML += 
+        `<tr>
+        <td>${game['start_time'].slice(0,2)}:${game['start_time'].slice(2,4)}</td>
+        <td>${game['field_name']}</td>
+        <td>
+            <p>${game['away_team']}</p>
+            <p style='font-size: 70%'>
+                ${
+                    game['game_status'] !== 'END' ? (
+                        game['away_sp'] !== null ? game['away_sp'] : ''
+                    )
+                    : game['away_wlt'] === 'W' ? (
+                        game['win_pitcher'] !== null ? game['win_pitcher'] : ''
+                    )
+                    : game['away_wlt'] === 'L' ? (
+                        game['lose_pitcher'] !== null ? game['lose_pitcher'] : ''
+                    )
+                    : ''
+                } ${gameWlt[game['away_wlt']]}
+            </p>
+        </td>
+        <td><img src="${game['away_team_img']}" style="width: 50px;"/></td>
+        <td>${game['away_point'] !== null ? game['away_point'] : '-'}</td>
+        <td>${setGameStatus(game['game_status'], game['game_inning'])}</td>
+        <td>${game['home_point'] !== null ? game['home_point'] : '-'}</td>
+        <td><img src="${game['home_team_img']}" style="width: 50px;"/></td>
+        <td>
+            <p>${game['home_team']}</p>
+            <p style='font-size: 70%'>
+                ${gameWlt[game['home_wlt']]} ${
+                    game['game_status'] !== 'END' ? (
+                        game['home_sp'] !== null ? game['home_sp'] : ''
+                    )
+                    : game['home_wlt'] === 'W' ? (
+                        game['win_pitcher'] !== null ? game['win_pitcher'] : ''
+                    )
+                    : game['home_wlt'] === 'L' ? (
+                        game['lose_pitcher'] !== null ? game['lose_pitcher'] : ''
+                    )
+                    : ''
+                }
+            </p>
+        </td>
+        </tr>`;
+    });
+
+    // Resize
+    requestAnimationFrame(() => {
+        scoreBoard.style.height = window.getComputedStyle(rankBoard).getPropertyValue('height');
+    });
+}
+function setGameStatus(status, inning) {
+    if (status !== "PLAY") {
+        const gameStatus = {
+            'BEFORE': '경기전', 'PLAY': '경기중', 'END': '종료', 'CANCEL': '경기취소',
+            'SUSPENDED': '서스펜', 'POSTPONE': '연기'
+        };
+        return gameStatus[status];
+    }
+
+    const half = inning[0];
+    const inningNum = parseInt(inning.slice(1), 10);
+
+    let halfText = "";
+    if (half === "T") {
+        halfText = "초";
+    } else if (half === "B") {
+        halfText = "말";
+    }
+
+    return `${inningNum}회${halfText}`;
+}
+SmartMirror.subscribe('kbo', updateKBOData);
@@ -0,0 +1,10 @@
+// modules/today/static/module.js
+
+SmartMirror.register('today', config => {
+    const today = document.getElementById('today-date');
+    function updateToday() {
+        today.innerText = formatTime(config.date_format, new Date());
+    }
+    updateToday();
+    setInterval(updateToday, config.refresh_interval);
+});
@@ -0,0 +1,140 @@
+# modules/weather/backend.py
+
+import threading
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+from circuit_breaker import circuit_breakers
+from http_client import http_client
+from metrics import UPSTREAM_BYTES, UPSTREAM_ERRORS, UPSTREAM_SECONDS, timed
+from singleflight import SingleFlight
+
+
+# Page loads in flight across every Selenium backend, keyed on URL and wait selectors.
+# A caller stops waiting for another's page load after a minute.
+page_loads = SingleFlight('selenium_page', timeout=60)
+
+
+class FetchBackend(ABC):
+    """Abstract base class for the ways WeatherModule can download a page."""
+
+    @abstractmethod
+    def fetch(self, url: str, wait_selectors: list[str]) -> str:
+        """Download a page and return its HTML.
+
+        Args:
+            url (str): Page to load.
+            wait_selectors (list[str]): CSS selectors the page is expected to contain.
+                Backends that render JavaScript wait for them before returning.
+
+        Returns:
+            str: HTML source of the page.
+        """
+        pass
+
+    def close(self):
+        """Release any resources held by the backend."""
+        pass
+
+    def stats(self) -> dict:
+        """Return the backend's state for monitoring."""
+        return {}
+
+
+class SeleniumBackend(FetchBackend):
+    """Load pages in headless Chrome drivers taken from a DriverPool.
+
+    Selenium is only imported, and the pool only created, by the first fetch, so
+    loading the module stays cheap. Each page load checks a driver out of the pool for
+    its exclusive use, so no two threads ever drive the same browser.
+    """
+
+    WAIT_TIMEOUT = 5
+
+    def __init__(self, max_drivers=2, max_page_loads=100, max_rss_mb=None):
+        self.pool_options = {
+            'max_drivers': max_drivers, 'max_page_loads': max_page_loads, 'max_rss_mb': max_rss_mb,
+        }
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    from .driver_pool import DriverPool
+                    self._pool = DriverPool(**self.pool_options)
+        return self._pool
+
+    def fetch(self, url, wait_selectors):
+        # Concurrent loads of the same page share one browser instead of one each.
+        return page_loads.do((url, tuple(wait_selectors)), lambda: self._load(url, wait_selectors))
+
+    def _load(self, url, wait_selectors):
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        host = urlsplit(url).netloc
+        with circuit_breakers.get(host).guard(), \
+                timed(UPSTREAM_SECONDS, UPSTREAM_ERRORS, host=host, client='selenium'):
+            with self.pool.driver() as driver:
+                driver.get(url)
+                for css_selector in wait_selectors:
+                    try:
+                        WebDriverWait(driver, timeout=self.WAIT_TIMEOUT).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+                        )
+                    except WebDriverException:
+                        pass
+                html = driver.page_source
+        UPSTREAM_BYTES.observe(len(html.encode('utf-8')), host=host, client='selenium')
+        return html
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+
+    def stats(self):
+        if self._pool is None:
+            return {'live_drivers': 0, 'max_drivers': self.pool_options['max_drivers']}
+        return self._pool.stats()
+
+
+class HTTPBackend(FetchBackend):
+    """Download pages with plain HTTP requests, without a browser."""
+
+    def fetch(self, url, wait_selectors):
+        response = http_client.get(url)
+        response.raise_for_status()
+        return response.text
+
+
+BACKENDS = {
+    'selenium': SeleniumBackend,
+    'http': HTTPBackend,
+}
+
+
+def create_backend(name: str, **options) -> FetchBackend:
+    """Create the fetch backend registered under `name`.
+
+    Args:
+        name (str): Backend name, one of the keys of `BACKENDS`.
+        options: Keyword arguments passed to the backend's constructor.
+
+    Returns:
+        FetchBackend: A new backend instance.
+
+    Raises:
+        ValueError: If no backend is registered under `name`.
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown weather backend '{name}'; expected one of {', '.join(BACKENDS)}"
+        ) from None
+    return backend_class(**options)
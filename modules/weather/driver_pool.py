@@ -0,0 +1,266 @@
+# modules/weather/driver_pool.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+def process_tree_rss(pid: int) -> int | None:
+    """Return the resident set size in bytes of a process and all of its descendants.
+
+    Args:
+        pid (int): Root process id (e.g., the chromedriver process).
+
+    Returns:
+        int | None: Total RSS in bytes, or None if `/proc` is not available.
+    """
+    children: dict[int, list[int]] = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing parenthesis.
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/statm', 'r') as file:
+                total += int(file.read().split()[1]) * page_size
+        except OSError:
+            pass
+        stack.extend(children.get(current, []))
+    return total
+
+
+class PooledDriver:
+    """A Chrome WebDriver together with its usage counters."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.page_loads = 0
+        self.created_at = time.time()
+
+    @property
+    def pid(self):
+        process = getattr(self.driver.service, 'process', None)
+        return process.pid if process else None
+
+    def rss(self) -> int | None:
+        """Return the memory used by the driver and its browser processes in bytes."""
+        return process_tree_rss(self.pid) if self.pid else None
+
+    def is_alive(self) -> bool:
+        try:
+            _ = self.driver.title
+            return True
+        except WebDriverException:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            print('WebDriver Quit Error:', e)
+
+
+class DriverPool:
+    """Lazily started, size-capped pool of headless Chrome drivers.
+
+    Browsers are launched on first use and reused afterwards. A driver is recycled once
+    it has served `max_page_loads` pages or its process tree uses more than `max_rss_mb`.
+
+    Example:
+        pool = DriverPool(max_drivers=2)
+        with pool.driver() as driver:
+            driver.get('https://weather.naver.com')
+    """
+
+    _driver_path = None
+    _driver_path_lock = threading.Lock()
+
+    def __init__(self, max_drivers: int = 2, max_page_loads: int = 100,
+                 max_rss_mb: int | None = None):
+        """
+        Args:
+            max_drivers (int): Maximum number of browsers running at the same time.
+            max_page_loads (int): Page loads after which a driver is restarted.
+            max_rss_mb (int | None): Memory ceiling in MB for one driver's process tree.
+                None disables the memory check.
+        """
+        self.max_drivers = max_drivers
+        self.max_page_loads = max_page_loads
+        self.max_rss_mb = max_rss_mb
+        self.chrome_options = Options()
+        self.chrome_options.add_argument('--headless')
+        self.chrome_options.add_argument('--disable-gpu')
+        self.chrome_options.add_argument('--no-sandbox')
+        self.chrome_options.add_argument('--disable-dev-shm-usage')
+        self._idle: list[PooledDriver] = []
+        self._busy: list[PooledDriver] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._starting = 0
+        self._created = 0
+        self._recycled = 0
+        self._page_loads = 0
+
+    @classmethod
+    def driver_path(cls) -> str:
+        """Return the chromedriver binary path, resolving it once per process.
+
+        `CHROMEDRIVER_PATH` is used when set (the Docker image installs chromedriver there);
+        otherwise webdriver_manager downloads a matching binary.
+        """
+        with cls._driver_path_lock:
+            if cls._driver_path is None:
+                cls._driver_path = (
+                    os.environ.get('CHROMEDRIVER_PATH') or ChromeDriverManager().install()
+                )
+            return cls._driver_path
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for exclusive use, starting one if needed.
+
+        Each checkout counts as one page load. The driver is returned to the pool, or
+        recycled if it hit a limit, when the block exits.
+
+        Yields:
+            WebDriver: A live Chrome WebDriver.
+        """
+        pooled = self._acquire()
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            self._release(pooled, discard=True)
+            raise
+        except BaseException:
+            self._release(pooled)
+            raise
+        else:
+            self._release(pooled)
+
+    def close(self):
+        """Quit every idle driver; busy drivers are quit when they are released.
+
+        Callers waiting for a driver, and any later checkout, get a RuntimeError.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._closed = True
+            self._condition.notify_all()
+        for pooled in idle:
+            pooled.quit()
+
+    def stats(self) -> dict:
+        """Return the pool's state for monitoring."""
+        with self._condition:
+            drivers = [('idle', pooled) for pooled in self._idle]
+            drivers += [('busy', pooled) for pooled in self._busy]
+            created, recycled, page_loads = self._created, self._recycled, self._page_loads
+        return {
+            'live_drivers': len(drivers),
+            'max_drivers': self.max_drivers,
+            'created': created,
+            'recycled': recycled,
+            'page_loads': page_loads,
+            'drivers': [
+                {
+                    'state': state,
+                    'pid': pooled.pid,
+                    'page_loads': pooled.page_loads,
+                    'rss_bytes': pooled.rss(),
+                    'age_seconds': round(time.time() - pooled.created_at, 1),
+                }
+                for state, pooled in drivers
+            ],
+        }
+
+    def _acquire(self) -> PooledDriver:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError('Driver pool is closed')
+                    if self._idle:
+                        # Checked out before its liveness check, so it keeps its slot.
+                        pooled = self._idle.pop()
+                        self._busy.append(pooled)
+                        break
+                    if len(self._busy) + self._starting < self.max_drivers:
+                        # Reserve the slot before launching so concurrent callers
+                        # respect the cap.
+                        self._starting += 1
+                        pooled = None
+                        break
+                    self._condition.wait()
+            if pooled is None:
+                return self._start_driver()
+            # Asking the browser can take a while; don't hold up the pool meanwhile.
+            if pooled.is_alive():
+                return pooled
+            with self._condition:
+                self._busy.remove(pooled)
+                self._recycled += 1
+                self._condition.notify()
+            pooled.quit()
+
+    def _start_driver(self) -> PooledDriver:
+        """Launch a driver into a slot reserved by `_acquire()`."""
+        try:
+            pooled = PooledDriver(webdriver.Chrome(
+                service=Service(self.driver_path()), options=self.chrome_options
+            ))
+        except BaseException:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._starting -= 1
+            self._created += 1
+            self._busy.append(pooled)
+        return pooled
+
+    def _release(self, pooled: PooledDriver, discard: bool = False):
+        pooled.page_loads += 1
+        if not discard:
+            discard = pooled.page_loads >= self.max_page_loads or self._over_memory(pooled)
+        with self._condition:
+            self._busy.remove(pooled)
+            self._page_loads += 1
+            if (discard or self._closed
+                    or len(self._idle) + len(self._busy) + self._starting >= self.max_drivers):
+                self._recycled += 1
+            else:
+                self._idle.append(pooled)
+                pooled = None
+            self._condition.notify()
+        if pooled is not None:
+            pooled.quit()
+
+    def _over_memory(self, pooled: PooledDriver) -> bool:
+        if self.max_rss_mb is None:
+            return False
+        rss = pooled.rss()
+        return rss is not None and rss > self.max_rss_mb * 1024 * 1024
@@ -2,21 +2,13 @@
 
 import os
 import re
-from time import sleep
-
-import toml
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 from module import APIModule
 from config import MODULE_LAYOUT
+from fetcher import fetch_all
+from metrics import PARSE_SECONDS, timed
+from selector import load_selectors, parse_html
+from .backend import create_backend
 
 
 class WeatherModule(APIModule):
@@ -24,20 +16,20 @@ class WeatherModule(APIModule):
 
     WEATHER_URL = 'https://weather.naver.com'
     AIR_URL = 'https://weather.naver.com/air'
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()), options=chrome_options
-    )
-    air_driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()), options=chrome_options
-    )
+    # Seconds allowed for loading both pages in one api() call.
+    FETCH_DEADLINE = 60
     selector: dict = {}
     img_rex = re.compile(r'^ico(?:_animation)?_wt\d+$')
     temp_rex = re.compile(r'-?(?:\d+\.\d+|\d+)')
+    root_id_rex = re.compile(r'^#([\w-]+)')
+    init_keys = ('backend', 'backend_options')
+
+    def __init__(self):
+        # Pages are fetched through the backend configured in MODULE_LAYOUT['weather']['backend'].
+        weather_config = MODULE_LAYOUT.get(self.name, {})
+        backend_name = weather_config.get('backend', 'selenium')
+        backend_options = weather_config.get('backend_options', {}).get(backend_name, {})
+        self.backend = create_backend(backend_name, **backend_options)
 
     @property
     def name(self):
@@ -74,48 +66,74 @@ class WeatherModule(APIModule):
         Returns:
             dict: API data for the module.
         """
-        if not self.is_driver_alive(self.driver):
-            self.driver.quit()
-            self.driver = self.create_driver()
-        self.driver.get(self.WEATHER_URL)
-        self.load_tag_selector(f'{os.path.dirname(os.path.abspath(__file__))}/tag.toml')
-        result = {
-            'location': self.get_location(),
-            'alarm': self.get_alarm(),
-            'weekly': self.get_weekly(),
-            'weather': self.get_weather(),
-        }
+        self.selector = load_selectors(f'{os.path.dirname(os.path.abspath(__file__))}/tag.toml')
+        # The weather and air pages are independent, so load them in parallel.
+        pages = fetch_all({
+            'weather': self.fetch_weather_page,
+            'air': self.fetch_air_page,
+        }, deadline=self.FETCH_DEADLINE)
+        result = pages['weather']
         # quick_pm10 / quick_pm25
-        quick_pm = self.get_air()
-        result['weather'].update(**quick_pm)
+        result['weather'].update(**pages['air'])
         return result
 
-    def create_driver(self):
-        return webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()), options=self.chrome_options
-        )
+    def fetch_weather_page(self):
+        wait_selectors = [
+            self.selector['location']['location'].pattern,
+            self.selector['alarm']['alarm'].pattern,
+            self.selector['weekly']['weekly_list'].pattern,
+            self.selector['weather']['now_img'].pattern,
+        ]
+        html = self.backend.fetch(self.WEATHER_URL, wait_selectors)
+        # Parse the page once and share the tree between all extractors.
+        with timed(PARSE_SECONDS, module=self.name, step='weather_soup'):
+            soup = self.get_soup(
+                html, wait_selectors + [sel.pattern for sel in self.selector['weather'].values()]
+            )
+        del html
+        try:
+            with timed(PARSE_SECONDS, module=self.name, step='weather_extract'):
+                return {
+                    'location': self.get_location(soup),
+                    'alarm': self.get_alarm(soup),
+                    'weekly': self.get_weekly(soup),
+                    'weather': self.get_weather(soup),
+                }
+        finally:
+            soup.decompose()
 
-    @staticmethod
-    def is_driver_alive(driver):
+    def fetch_air_page(self):
+        air_html = self.backend.fetch(
+            self.AIR_URL, [self.selector['weather']['quick_air_check'].pattern]
+        )
+        with timed(PARSE_SECONDS, module=self.name, step='air_soup'):
+            air_soup = self.get_soup(air_html, [self.selector['weather']['quick_air'].pattern])
+        del air_html
         try:
-            _ = driver.title
-            return True
-        except WebDriverException:
-            return False
+            with timed(PARSE_SECONDS, module=self.name, step='air_extract'):
+                return self.get_air(air_soup)
+        finally:
+            air_soup.decompose()
 
-    def load_tag_selector(self, file_path):
-        with open(file_path, 'r') as file:
-            self.selector = toml.load(file)
+    def status(self):
+        """Return the fetch backend's state (e.g., live browsers and their memory).
 
-    def get_location(self):
+        Returns:
+            dict: Backend statistics.
+        """
+        return self.backend.stats()
+
+    def close(self):
+        """Quit the backend's browsers."""
+        self.backend.close()
+
+    def get_location(self, soup):
         selector = self.selector['location']['location']
-        soup = self.get_soup(selector)
-        return soup.select_one(selector).get_text()
+        return selector.select_one(soup).get_text()
 
-    def get_alarm(self):
+    def get_alarm(self, soup):
         selector = self.selector['alarm']['alarm']
-        soup = self.get_soup(selector)
-        alarm_list = soup.select(selector)
+        alarm_list = selector.select(soup)
         return [
             a.get_text(strip=True)
             for alarm in alarm_list
@@ -123,42 +141,41 @@ class WeatherModule(APIModule):
             if a.get_text(strip=True)
         ]
 
-    def get_weather(self):
+    def get_weather(self, soup):
         selector = self.selector['weather']
-        soup = self.get_soup(selector['now_img'])
         # now_img
-        now_img_tag = soup.select_one(selector['now_img'])
+        now_img_tag = selector['now_img'].select_one(soup)
         now_img_class_list = now_img_tag.get('class', [])
         now_img = self.get_img_url(now_img_class_list)
         # now_weather
-        now_weather_tag = soup.select_one(selector['now_weather'])
+        now_weather_tag = selector['now_weather'].select_one(soup)
         now_weather = now_weather_tag.get_text()
         # now_temperature
-        now_temp_tag = soup.select_one(selector['now_temperature'])
+        now_temp_tag = selector['now_temperature'].select_one(soup)
         now_temperature = self.parse_decimal(now_temp_tag.get_text(strip=True, separator=' '))
         # quick_rain
-        quick_rain_tag = soup.select_one(selector['quick_rain'])
+        quick_rain_tag = selector['quick_rain'].select_one(soup)
         if quick_rain_tag:
             now_weather += f' {quick_rain_tag.get_text()}mm'
         # quick_humidity
-        quick_humidity_tag = soup.select_one(selector['quick_humidity'])
+        quick_humidity_tag = selector['quick_humidity'].select_one(soup)
         quick_humidity = quick_humidity_tag.get_text()
         # quick_apparent_temperature
-        quick_app_temperature_tag = soup.select_one(selector['quick_apparent_temperature'])
+        quick_app_temperature_tag = selector['quick_apparent_temperature'].select_one(soup)
         quick_apparent_temperature = self.parse_decimal(quick_app_temperature_tag.get_text())
         # quick_wind_direction
-        quick_wind_direction_tag = soup.select_one(selector['quick_wind_direction'])
+        quick_wind_direction_tag = selector['quick_wind_direction'].select_one(soup)
         quick_wind_direction = quick_wind_direction_tag.get_text()
         # quick_wind_speed
-        quick_wind_speed_tag = soup.select_one(selector['quick_wind_speed'])
+        quick_wind_speed_tag = selector['quick_wind_speed'].select_one(soup)
         quick_wind_speed = quick_wind_speed_tag.get_text()
         # quick_uv
-        quick_uv_check_tag = soup.select_one(selector['quick_uvc'])
+        quick_uv_check_tag = selector['quick_uvc'].select_one(soup)
         if quick_uv_check_tag and quick_uv_check_tag.get_text() == 'UV':
-            quick_uv_tag = soup.select_one(selector['quick_uv1'])
+            quick_uv_tag = selector['quick_uv1'].select_one(soup)
             quick_uv = quick_uv_tag.get_text()
         else:
-            quick_uv_tag = soup.select_one(selector['quick_uv2'])
+            quick_uv_tag = selector['quick_uv2'].select_one(soup)
             quick_uv = quick_uv_tag.get_text()
         return {
             'now_img': now_img,
@@ -186,11 +203,10 @@ class WeatherModule(APIModule):
         else:
             return 'level4_1'
 
-    def get_weekly(self):
+    def get_weekly(self, soup):
         selector = self.selector['weekly']
-        soup = self.get_soup(selector['weekly_list'])
         weekly: list[dict] = []
-        for week in soup.select(selector['weekly_list']):
+        for week in selector['weekly_list'].select(soup):
             data = {}
             data['weekly_day'] = week.find('strong', class_='day').get_text()
             data['weekly_date'] = week.find('span', class_='date').get_text()
@@ -207,13 +223,8 @@ class WeatherModule(APIModule):
             weekly.append(data)
         return weekly
     
-    def get_air(self):
-        if not self.is_driver_alive(self.air_driver):
-            self.air_driver.quit()
-            self.air_driver = self.create_driver()
-        self.air_driver.get(self.AIR_URL)
-        soup = self.get_soup(self.selector['weather']['quick_air_check'], driver=self.air_driver)
-        air_soup = soup.select_one(self.selector['weather']['quick_air'])
+    def get_air(self, soup):
+        air_soup = self.selector['weather']['quick_air'].select_one(soup)
         tags = air_soup.find_all('div', class_='card_data_item')
         # PM 10
         pm10 = tags[0].find('span', class_='dount_value_text').get_text()
@@ -228,14 +239,26 @@ class WeatherModule(APIModule):
             'quick_pm25_color': pm25_color,
         }
 
-    def get_soup(self, css_selector, driver=driver):
-        try:
-            WebDriverWait(driver, timeout=5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
-            )
-        except WebDriverException:
-            pass
-        return BeautifulSoup(driver.page_source, 'html.parser')
+    def get_soup(self, html, css_selectors):
+        """Parse only the subtrees of `html` that `css_selectors` can reach.
+
+        Selectors anchored on an element id (e.g., `#content > ...`) only need that
+        element's subtree, so everything else in the page is skipped while parsing.
+
+        Args:
+            html (str): Page source.
+            css_selectors (list[str]): Selectors the caller is going to run on the tree.
+
+        Returns:
+            BeautifulSoup: Parsed tree.
+        """
+        root_ids = set()
+        for css_selector in css_selectors:
+            match = self.root_id_rex.match(css_selector)
+            if match is None:
+                return parse_html(html)
+            root_ids.add(match[1])
+        return parse_html(html, only_ids=sorted(root_ids))
 
     def get_img_url(self, class_list):
         img_index = [
@@ -0,0 +1,104 @@
+// modules/weather/static/module.js
+
+function updateWeatherData(data) {
+    // location
+    const location = document.getElementById('weather-location');
+    location.innerHTML = data.location;
+
+    // alarm
+    alarm_text = `⚠ ${data.alarm.join(' · ')}`;
+    data.alarm.join(' · ')
+    const alarm = document.getElementById('weather-alarm');
+    alarm.innerHTML = `<div>${alarm_text}</div>`;
+    if (alarm.scrollWidth > alarm.clientWidth) {
+        const alarm_content = alarm.querySelector('div');
+        alarm_content.className = 'animate-scroll';
+        alarm.appendChild(alarm_content.cloneNode(true))
+    }
+
+    // weather now
+    const now_img = document.getElementById('weather-now_img');
+    const now_temperature = document.getElementById('weather-now_temperature');
+    const now_weather = document.getElementById('weather-now_weather');
+    now_img.src = data.weather.now_img
+    now_temperature.innerHTML = `${data.weather.now_temperature}°C`;
+    now_weather.innerHTML = data.weather.now_weather;
+
+    // weather quick area
+    const quick_humidity = document.getElementById('weather-quick_humidity');
+    const quick_apparent_temperature = document.getElementById('weather-quick_apparent_temperature');
+    const quick_wind_direction = document.getElementById('weather-quick_wind_direction');
+    const quick_wind_speed = document.getElementById('weather-quick_wind_speed');
+    const quick_uv = document.getElementById('weather-quick_uv');
+    const quick_pm10 = document.getElementById('weather-quick_pm10');
+    const quick_pm25 = document.getElementById('weather-quick_pm25');
+    quick_humidity.innerHTML = data.weather.quick_humidity;
+    quick_apparent_temperature.innerHTML = data.weather.quick_apparent_temperature;
+    quick_wind_direction.innerHTML = data.weather.quick_wind_direction;
+    quick_wind_speed.innerHTML = data.weather.quick_wind_speed;
+    quick_uv.innerHTML = data.weather.quick_uv;
+    quick_uv.className = data.weather.quick_uv_color;
+    quick_pm10.innerHTML = data.weather.quick_pm10;
+    data.weather.quick_pm10_color.forEach(cls => {
+        quick_pm10.className = cls;
+    });
+    quick_pm25.innerHTML = data.weather.quick_pm25;
+    data.weather.quick_pm25_color.forEach(cls => {
+        quick_pm25.className = cls;
+    });
+
+    // weekly today
+    const today = document.getElementById('weather-today');
+    const today_am_img = document.getElementById('weather-today_am_img');
+    const today_am_rainfall = document.getElementById('weather-today_am_rainfall');
+    const today_ap_img = document.getElementById('weather-today_ap_img');
+    const today_ap_rainfall = document.getElementById('weather-today_ap_rainfall');
+    const today_low_temperature = document.getElementById('weather-today_low_temperature');
+    const today_high_temperature = document.getElementById('weather-today_high_temperature');
+    today.innerHTML = `${data.weekly[0].weekly_day}<br>${data.weekly[0].weekly_date}`;
+    today_am_img.src = data.weekly[0].weekly_am_img;
+    today_am_rainfall.innerHTML = `오전<br>${data.weekly[0].weekly_am_rainfall}%`;
+    today_ap_img.src = data.weekly[0].weekly_ap_img;
+    today_ap_rainfall.innerHTML = `오후<br>${data.weekly[0].weekly_ap_rainfall}%`;
+    today_low_temperature.innerHTML = `${data.weekly[0].weekly_low_temperature}°C`;
+    today_high_temperature.innerHTML = `${data.weekly[0].weekly_high_temperature}°C`;
+
+    // weekly tomorrow
+    const tomorrow = document.getElementById('weather-tomorrow');
+    const tomorrow_am_img = document.getElementById('weather-tomorrow_am_img');
+    const tomorrow_am_rainfall = document.getElementById('weather-tomorrow_am_rainfall');
+    const tomorrow_ap_img = document.getElementById('weather-tomorrow_ap_img');
+    const tomorrow_ap_rainfall = document.getElementById('weather-tomorrow_ap_rainfall');
+    const tomorrow_low_temperature = document.getElementById('weather-tomorrow_low_temperature');
+    const tomorrow_high_temperature = document.getElementById('weather-tomorrow_high_temperature');
+    tomorrow.innerHTML =  `${data.weekly[1].weekly_day}<br>${data.weekly[1].weekly_date}`;
+    tomorrow_am_img.src = data.weekly[1].weekly_am_img;
+    tomorrow_am_rainfall.innerHTML = `오전<br>${data.weekly[1].weekly_am_rainfall}%`;
+    tomorrow_ap_img.src = data.weekly[1].weekly_ap_img;
+    tomorrow_ap_rainfall.innerHTML = `오후<br>${data.weekly[1].weekly_ap_rainfall}%`;
+    tomorrow_low_temperature.innerHTML = `${data.weekly[1].weekly_low_temperature}°C`;
+    tomorrow_high_temperature.innerHTML = `${data.weekly[1].weekly_high_temperature}°C`;
+
+    // weekly the others
+    const weekly_row = document.getElementById('weather-weekly_row');
+    weekly_row.innerHTML = ''
+    data.weekly.slice(2).forEach(weekly => {
+        weekly_row.innerHTML += 
+        `<td style="border: 0px;">
+            <div>${weekly['weekly_day']}</div>
+            <div>${weekly['weekly_date']}</div>
+            <div>
+                <img id="weather_img" src="${weekly["weekly_am_img"]}" style="width: 50px;"/>
+                <img id="weather_img" src="${weekly["weekly_ap_img"]}" style="width: 50px;"/>
+            </div>
+            <div>
+                <span style="color: #8888ff;">${weekly["weekly_low_temperature"]}°C</span> / 
+                <span style="color: #ff8888;">${weekly["weekly_high_temperature"]}°C</span>
+            </div>
+            <div>
+                ${weekly['weekly_am_rainfall']}% ${weekly['weekly_ap_rainfall']}%
+            </div>
+        </td>`
+    });
+}
+SmartMirror.subscribe('weather', updateWeatherData);
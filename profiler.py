@@ -0,0 +1,120 @@
+# profiler.py
+
+"""
+Opt-in cProfile sampling of requests and module refreshes.
+
+Profiling is off by default. `SMARTMIRROR_PROFILE_RATE` profiles a random fraction
+of index/API requests and module `api()` refreshes, and an admin can force a single
+request with `?profile=<SMARTMIRROR_ADMIN_TOKEN>`. Each profile is written to
+`PROFILE_DIR` as a pstats file, which can be read on the device itself:
+
+    python -m pstats data/profiles/<file>.prof
+
+Only one profile runs at a time. Since Python 3.12, cProfile records every thread
+of the process, so work done on the fetch pool during a profiled refresh is included.
+"""
+
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from config import PROFILE_DIR, PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE
+
+
+class Profiler:
+    """Profile a sampled fraction of calls and keep the newest profiles on disk.
+
+    Example:
+        with profiler.profile('api', 'weather'):
+            data = weather_module.api()
+    """
+
+    SUFFIX = '.prof'
+    name_rex = re.compile(r'[^\w.-]+')
+
+    def __init__(self, directory: str, sample_rate: float = 0.0, max_files: int = 100):
+        """
+        Args:
+            directory (str): Where profiles are written; created on first use.
+            sample_rate (float): Fraction of calls profiled without being forced (0 to 1).
+            max_files (int): Profiles kept in `directory`; the oldest are deleted first.
+        """
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        # cProfile allows a single active profiler per process.
+        self._active = threading.Lock()
+
+    @contextmanager
+    def profile(self, kind: str, name: str, force: bool = False):
+        """Profile the block if it is sampled (or `force` is set) and no profile is running.
+
+        Args:
+            kind (str): What is profiled (e.g., 'request' or 'api').
+            name (str): Which one (e.g., the endpoint or module name).
+            force (bool): Profile regardless of the sample rate.
+        """
+        sampled = force or (self.sample_rate > 0 and random.random() < self.sample_rate)
+        if not sampled or not self._active.acquire(blocking=False):
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiling tool (e.g., a debugger) already holds the hook.
+            self._active.release()
+            print(f'Profiling {kind} {name} skipped: {e}')
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._active.release()
+            # Failed calls are saved too; they are often the slow ones.
+            self._save(profile, kind, name, time.perf_counter() - start)
+
+    def list(self) -> list[dict]:
+        """Return the saved profiles, newest first.
+
+        Returns:
+            list[dict]: `name`, `size` in bytes and `created` Unix timestamp of each file.
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.directory)
+                       if entry.is_file() and entry.name.endswith(self.SUFFIX)]
+        except OSError:
+            return []
+        profiles = [
+            {'name': entry.name, 'size': stat.st_size, 'created': stat.st_mtime}
+            for entry in entries
+            for stat in (entry.stat(),)
+        ]
+        return sorted(profiles, key=lambda item: item['created'], reverse=True)
+
+    def _save(self, profile: cProfile.Profile, kind: str, name: str, elapsed: float):
+        os.makedirs(self.directory, exist_ok=True)
+        safe_name = self.name_rex.sub('_', name).strip('_') or 'root'
+        file_name = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{kind}-{safe_name}"
+            f'-{elapsed * 1000:.0f}ms{self.SUFFIX}'
+        )
+        try:
+            profile.dump_stats(os.path.join(self.directory, file_name))
+        except OSError as e:
+            print(f'Failed to save profile {file_name}: {e}')
+            return
+        for stale in self.list()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, stale['name']))
+            except OSError:
+                pass
+
+
+profiler = Profiler(PROFILE_DIR, sample_rate=PROFILE_SAMPLE_RATE, max_files=PROFILE_MAX_FILES)
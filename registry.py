@@ -0,0 +1,402 @@
+# registry.py
+
+"""
+Module registry for the Smart Mirror project.
+
+Modules listed in the layout configuration are imported and instantiated once.
+Their container HTML is rendered ahead of time and grouped by position, and is
+only rebuilt when a module's configuration entry or template files change.
+`warm_up()` does the loading and first render of all modules concurrently in the
+background, so the server can accept connections right away. `reconfigure()`
+applies a reloaded layout, touching only the modules whose entries changed.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from metrics import CACHE_REQUESTS, MODULE_ERRORS, MODULE_SECONDS, timed
+
+
+@dataclass(frozen=True)
+class Page:
+    """A fully rendered index page.
+
+    Attributes:
+        html (str): Rendered HTML of the page.
+        etag (str): Content hash of `html`, used for conditional requests.
+        last_modified (float): Unix timestamp of the build that produced `html`.
+    """
+
+    html: str
+    etag: str
+    last_modified: float
+
+
+@dataclass
+class LayoutDiff:
+    """Differences between the running module layout and a reloaded one.
+
+    Attributes:
+        added (list[str]): Modules only in the new layout.
+        removed (list[str]): Modules only in the running layout; they are unloaded.
+        reloaded (list[str]): Modules instantiated again, because one of their
+            `init_keys` changed or they had failed to load.
+        changed (list[str]): Modules whose entry changed but keep their instance;
+            they are only re-rendered.
+        refreshed (list[str]): Changed modules one of whose `data_keys` changed, so
+            their data is out of date too.
+    """
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    reloaded: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    refreshed: list[str] = field(default_factory=list)
+    # Only the order of the modules changed.
+    reordered: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.reloaded or self.changed or self.reordered)
+
+    def __str__(self) -> str:
+        parts = [
+            f"{label} {', '.join(names)}"
+            for label, names in (('added', self.added), ('removed', self.removed),
+                                 ('reloaded', self.reloaded), ('changed', self.changed))
+            if names
+        ]
+        return '; '.join(parts) or 'reordered'
+
+
+class ModuleRegistry:
+    """Hold module instances and their pre-rendered containers.
+
+    Example:
+        registry = ModuleRegistry(MODULE_LAYOUT)
+        registry.load()
+        page = registry.page(lambda modules: render_template('index.html', modules=modules))
+    """
+
+    # Seconds between two checks of the configuration and template files.
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self, layout: dict, template_dirs: tuple[str, ...] = ()):
+        """
+        Args:
+            layout (dict): Module layout configuration (see `config.MODULE_LAYOUT`).
+            template_dirs (tuple[str, ...]): Extra template directories the page depends on
+                (e.g., the application's own `templates` directory).
+        """
+        self.layout = layout
+        # Module names in layout order, which the page follows. Kept apart from the
+        # shared layout dict so a reload never has to re-insert entries others read.
+        self._order = list(layout)
+        self.template_dirs = template_dirs
+        self.modules = {}
+        self._module_dirs = {}
+        self._containers = {}
+        self._page = None
+        self._page_key = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # Module name -> 'loading', 'ready' or 'failed'.
+        self._states: dict[str, str] = {}
+        # Module name -> why it failed to load, for modules in the 'failed' state.
+        self._errors: dict[str, str] = {}
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._warm = threading.Event()
+        # Nothing to wait for until warm_up() is called.
+        self._warm.set()
+
+    def load(self):
+        """Import and instantiate every module listed in the layout."""
+        for mod_name in self.layout:
+            self.load_module(mod_name)
+
+    def warm_up(self, on_loaded: Callable[[str, object], None] | None = None,
+                max_workers: int = 4, names: list[str] | None = None):
+        """Load and pre-render modules concurrently, without blocking the caller.
+
+        Args:
+            on_loaded (Callable[[str, object], None] | None): Called from a worker thread
+                with the name and instance of each module that loaded successfully.
+            max_workers (int): Modules initialized at the same time.
+            names (list[str] | None): Modules to warm up. Defaults to the whole layout;
+                only a full warm-up holds back `wait_warm()`.
+        """
+        def warm(mod_name):
+            mod_instance = self.load_module(mod_name)
+            if mod_instance is None:
+                return
+            with self._lock:
+                mod_config = self.layout.get(mod_name)
+                if mod_config is None:
+                    # Removed by a config reload in the meantime.
+                    return
+                self._container(mod_name, mod_config, mod_instance)
+            if on_loaded is not None:
+                try:
+                    on_loaded(mod_name, mod_instance)
+                except Exception as e:
+                    print(f"Failed to start module '{mod_name}': {e}")
+
+        def run():
+            with ThreadPoolExecutor(max_workers=max_workers,
+                                    thread_name_prefix='warm-up') as executor:
+                list(executor.map(warm, names or list(self.layout)))
+            self._warm.set()
+
+        if names is None:
+            self._warm.clear()
+        threading.Thread(target=run, name='module-warm-up', daemon=True).start()
+
+    def state(self, mod_name: str) -> str:
+        """Return 'pending', 'loading', 'ready' or 'failed' for `mod_name`."""
+        return self._states.get(mod_name, 'pending')
+
+    def error(self, mod_name: str) -> str | None:
+        """Return why `mod_name` failed to load, or None if it didn't fail."""
+        return self._errors.get(mod_name)
+
+    def wait_warm(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for `warm_up()` to finish; return whether it has."""
+        return self._warm.wait(timeout)
+
+    def readiness(self) -> dict:
+        """Return the warm-up state of every module in the layout.
+
+        Returns:
+            dict: Mapping of module name to `{state, rendered}`, where `state` is one of
+                'pending', 'loading', 'ready' or 'failed'.
+        """
+        return {
+            mod_name: {
+                'state': self.state(mod_name),
+                'rendered': mod_name in self._containers,
+            }
+            for mod_name in list(self.layout)
+        }
+
+    def load_module(self, mod_name: str):
+        """Import and instantiate a single module.
+
+        Args:
+            mod_name (str): Name of the package under `modules/`.
+
+        Returns:
+            BaseModule | None: The module instance, or None if loading failed.
+        """
+        if mod_name in self.modules:
+            return self.modules[mod_name]
+        with self._lock:
+            load_lock = self._load_locks.setdefault(mod_name, threading.Lock())
+        # Concurrent callers wait for a single instance instead of creating their own.
+        with load_lock:
+            if mod_name in self.modules:
+                return self.modules[mod_name]
+            self._states[mod_name] = 'loading'
+            try:
+                with timed(MODULE_SECONDS, MODULE_ERRORS, module=mod_name, stage='load'):
+                    mod_module = importlib.import_module(f'modules.{mod_name}')
+                    mod_instance = mod_module.get_module()
+            except Exception as e:
+                print(f"Failed to load module '{mod_name}': {e}")
+                self._errors[mod_name] = f'{type(e).__name__}: {e}'
+                self._states[mod_name] = 'failed'
+                return None
+            self._errors.pop(mod_name, None)
+            self._module_dirs[mod_name] = os.path.dirname(os.path.abspath(mod_module.__file__))
+            self.modules[mod_name] = mod_instance
+            self._states[mod_name] = 'ready'
+            return mod_instance
+
+    def get(self, mod_name: str):
+        """Return the loaded instance for `mod_name`, or None."""
+        return self.modules.get(mod_name)
+
+    def reconfigure(self, layout: dict,
+                    on_unload: Callable[[str], None] | None = None) -> LayoutDiff:
+        """Switch to a new module layout, keeping every module whose entry is unchanged.
+
+        The running layout dict is updated in place, so modules reading their entry
+        from `config.MODULE_LAYOUT` see the new values. Entries are only assigned or,
+        for removed modules, deleted: readers elsewhere must look them up with `.get()`
+        and iterate over a copy. A new order only changes the page. Removed modules and
+        modules whose `init_keys` changed are unloaded and closed; call `warm_up()` with the
+        added and reloaded names to load them again. Changed modules are re-rendered
+        by the next `page()`, which no longer waits for `CHECK_INTERVAL`.
+
+        Args:
+            layout (dict): The new module layout.
+            on_unload (Callable[[str], None] | None): Called with the name of each
+                removed or reloaded module before its instance is closed, so nothing
+                keeps using it.
+
+        Returns:
+            LayoutDiff: What changed.
+        """
+        with self._lock:
+            diff = self._diff(layout)
+            if not diff:
+                return diff
+            for mod_name in diff.removed:
+                del self.layout[mod_name]
+            for mod_name in diff.added + diff.reloaded + diff.changed:
+                self.layout[mod_name] = layout[mod_name]
+            self._order = list(layout)
+            unloaded = []
+            for mod_name in diff.removed + diff.reloaded:
+                if mod_name in self.modules:
+                    unloaded.append((mod_name, self.modules.pop(mod_name)))
+                self._containers.pop(mod_name, None)
+                self._states.pop(mod_name, None)
+                self._errors.pop(mod_name, None)
+            self._checked_at = 0.0
+        if on_unload is not None:
+            for mod_name in diff.removed + diff.reloaded:
+                on_unload(mod_name)
+        for mod_name, mod_instance in unloaded:
+            try:
+                mod_instance.close()
+            except Exception as e:
+                print(f"Failed to close module '{mod_name}': {e}")
+        return diff
+
+    def _diff(self, layout: dict) -> LayoutDiff:
+        """Compare `layout` with the running one. Must be called with `_lock` held."""
+        diff = LayoutDiff(
+            added=[mod_name for mod_name in layout if mod_name not in self.layout],
+            removed=[mod_name for mod_name in self.layout if mod_name not in layout],
+        )
+        for mod_name, mod_config in layout.items():
+            old_config = self.layout.get(mod_name)
+            if old_config is None or old_config == mod_config:
+                continue
+            mod_instance = self.modules.get(mod_name)
+            init_keys = getattr(mod_instance, 'init_keys', ())
+            if mod_instance is None and self.state(mod_name) == 'failed' or any(
+                old_config.get(key) != mod_config.get(key) for key in init_keys
+            ):
+                diff.reloaded.append(mod_name)
+            else:
+                diff.changed.append(mod_name)
+                data_keys = getattr(mod_instance, 'data_keys', ())
+                if any(old_config.get(key) != mod_config.get(key) for key in data_keys):
+                    diff.refreshed.append(mod_name)
+        common = [mod_name for mod_name in self._order if mod_name in layout]
+        diff.reordered = common != [mod_name for mod_name in layout if mod_name in self.layout]
+        return diff
+
+    def page(self, render_page: Callable[[dict], str], key: str = '') -> Page:
+        """Return the current index page, rebuilding it only if its inputs changed.
+
+        Args:
+            render_page (Callable[[dict], str]): Renders the page from a mapping of
+                position to a list of container HTML strings.
+            key (str): Any other input of the page (e.g., the script bundle's name);
+                the page is rebuilt when it changes.
+
+        Returns:
+            Page: The rendered page with its validators.
+        """
+        now = time.monotonic()
+        if self._page is not None and now - self._checked_at < self.CHECK_INTERVAL:
+            CACHE_REQUESTS.inc(cache='page', result='hit')
+            return self._page
+        # Load modules no warm-up has started yet; `load_module` takes `_lock` itself.
+        for mod_name in list(self.layout):
+            if self.state(mod_name) == 'pending':
+                self.load_module(mod_name)
+        with self._lock:
+            self._checked_at = now
+            modules_by_position = self._render_containers()
+            page_key = (key, self._page_key_for(modules_by_position))
+            if self._page is None or page_key != self._page_key:
+                CACHE_REQUESTS.inc(cache='page', result='miss')
+                html = render_page(modules_by_position)
+                self._page = Page(
+                    html=html,
+                    etag=hashlib.sha256(html.encode('utf-8')).hexdigest(),
+                    last_modified=time.time(),
+                )
+                self._page_key = page_key
+            else:
+                CACHE_REQUESTS.inc(cache='page', result='hit')
+            return self._page
+
+    def _render_containers(self) -> dict:
+        modules_by_position = {}
+        for mod_name in self._order:
+            mod_config = self.layout.get(mod_name)
+            mod_instance = self.modules.get(mod_name)
+            if mod_config is None or mod_instance is None:
+                continue
+            container_html = self._container(mod_name, mod_config, mod_instance)
+            if container_html is None:
+                continue
+            position = mod_config.get('position', 'default')
+            modules_by_position.setdefault(position, []).append(container_html)
+        return modules_by_position
+
+    def _container(self, mod_name: str, mod_config: dict, mod_instance) -> str | None:
+        """Return the module's container HTML, re-rendering it if its inputs changed.
+
+        Must be called with `_lock` held.
+        """
+        key = self._render_key(mod_name, mod_config)
+        cached = self._containers.get(mod_name)
+        if cached is not None and cached[0] == key:
+            CACHE_REQUESTS.inc(cache='container', result='hit')
+            return cached[1]
+        CACHE_REQUESTS.inc(cache='container', result='miss')
+        try:
+            with timed(MODULE_SECONDS, MODULE_ERRORS, module=mod_name, stage='render'):
+                container_html = self._render_container(mod_instance, mod_config)
+        except Exception as e:
+            print(f"Failed to render module '{mod_name}': {e}")
+            return None
+        self._containers[mod_name] = (key, container_html)
+        return container_html
+
+    @staticmethod
+    def _render_container(mod_instance, mod_config: dict) -> str:
+        # Get the module's HTML content.
+        rendered_html = mod_instance.render()
+        # Build inline style string based on configuration settings
+        style = ''
+        if 'width' in mod_config:
+            style += f'width: {mod_config['width']};'
+        if 'height' in mod_config:
+            style += f' height: {mod_config['height']};'
+        # Wrap the module's HTML in a container div with the inline style
+        return f"<div class='module' style='{style}'>{rendered_html}</div>"
+
+    def _render_key(self, mod_name: str, mod_config: dict) -> tuple:
+        """Return the inputs a module's rendered container depends on."""
+        config_key = json.dumps(mod_config, sort_keys=True, default=str)
+        templates_dir = os.path.join(self._module_dirs[mod_name], 'templates')
+        return config_key, self._dir_mtimes(templates_dir)
+
+    def _page_key_for(self, modules_by_position: dict) -> tuple:
+        return (
+            json.dumps(modules_by_position, sort_keys=True),
+            tuple(self._dir_mtimes(path) for path in self.template_dirs),
+        )
+
+    @staticmethod
+    def _dir_mtimes(path: str) -> tuple:
+        try:
+            with os.scandir(path) as entries:
+                return tuple(sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in entries if entry.is_file()
+                ))
+        except OSError:
+            return ()
@@ -0,0 +1,401 @@
+# scheduler.py
+
+"""
+Background refresh scheduler for API modules.
+
+Each registered module's `api()` is called in the background at the module's
+configured refresh interval. Every job is a task on the shared event loop (see
+event_loop.py): coroutine `api()` methods are awaited there directly, and
+synchronous ones run on its thread pool only while they refresh. Results are kept
+as versioned snapshots so API endpoints can answer from memory instead of hitting
+the upstream per request.
+When a refresh fails, the last good snapshot keeps being served and the refresh is
+retried sooner, with backoff. The failure is published along with the snapshots, so
+processes following the store report it too.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable
+
+from event_loop import event_loop
+from metrics import MODULE_ERRORS, MODULE_SECONDS, timed
+from profiler import profiler
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Result of a single successful `api()` call.
+
+    Attributes:
+        data: The value returned by the module's `api()` method.
+        version (int): Counter bumped each time the data actually changes.
+        fetched_at (float): Unix timestamp of the fetch that produced this snapshot.
+        stale (bool): True for snapshots restored from a previous run that have not
+            been refreshed yet.
+    """
+
+    data: Any
+    version: int
+    fetched_at: float
+    stale: bool = False
+
+    @cached_property
+    def body(self) -> bytes:
+        """`data` serialized as UTF-8 JSON, computed once per snapshot."""
+        return json.dumps(self.data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @cached_property
+    def etag(self) -> str:
+        """Strong entity tag of `body`: a SHA-256 content hash."""
+        return hashlib.sha256(self.body).hexdigest()
+
+    @cached_property
+    def gzip_body(self) -> bytes:
+        """`body` compressed with gzip, computed once per snapshot."""
+        return gzip.compress(self.body, mtime=0)
+
+
+class _Job:
+    """Refresh loop state for one module."""
+
+    def __init__(self, name: str, func: Callable[[], Any], interval: float,
+                 next_interval: Callable[[float], float] | None = None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_interval = next_interval
+        # asyncio.Event, created on the event loop by Scheduler._run(); set it
+        # through Scheduler._wake() only.
+        self.wakeup = None
+        self.task = None
+        # Monotonic time of the last refresh and of the next one.
+        self.refreshed_at = 0.0
+        self.due = 0.0
+        # Set by Scheduler.refresh(); honoured even if it arrives mid-refresh.
+        self.forced = False
+        self.cancelled = False
+        # Consecutive failed refreshes.
+        self.failures = 0
+
+
+class Scheduler:
+    """Run module `api()` calls in the background and keep their latest snapshots.
+
+    Example:
+        scheduler = Scheduler()
+        scheduler.add('weather', weather_module.api, interval=3600)
+        scheduler.start()
+        snapshot = scheduler.get('weather')
+    """
+
+    # Lower bound for the refresh interval in seconds, so a tiny `refresh_interval`
+    # in the configuration cannot turn into a tight scraping loop.
+    MIN_INTERVAL = 1.0
+    # Seconds before retrying a failed refresh, doubled after each further failure and
+    # never longer than the normal interval.
+    RETRY_INTERVAL = 30.0
+
+    def __init__(self, store=None):
+        """
+        Args:
+            store (SnapshotStore | None): Where every new snapshot is persisted, so it
+                can be restored after a restart.
+        """
+        self.store = store
+        self._jobs: dict[str, _Job] = {}
+        self._snapshots: dict[str, Snapshot] = {}
+        # Error of the latest refresh, for jobs whose latest refresh failed.
+        self._failures: dict[str, str] = {}
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._started = False
+
+    def add(self, name: str, func: Callable[[], Any], interval: float,
+            next_interval: Callable[[float], float] | None = None):
+        """Register a function to be refreshed in the background.
+
+        Adding a job under an existing name replaces it. If `func` is unchanged, only
+        the schedule is updated and the job is not refreshed early.
+
+        Args:
+            name (str): Unique key for the snapshot (usually the module name).
+            func (Callable): Zero-argument callable returning the data to cache, or a
+                coroutine function whose result is cached.
+            interval (float): Seconds between two refreshes.
+            next_interval (Callable[[float], float] | None): Called after each refresh
+                with `interval`; returns the seconds to wait before the next one. Lets a
+                module follow its upstream's own schedule.
+        """
+        interval = max(float(interval), self.MIN_INTERVAL)
+        existing = self._jobs.get(name)
+        if existing is not None and existing.func == func:
+            existing.interval = interval
+            existing.next_interval = next_interval
+            if existing.refreshed_at:
+                existing.due = existing.refreshed_at + self._next_wait(existing)
+                self._wake(existing)
+            return
+        if existing is not None:
+            self._cancel(existing)
+        job = _Job(name, func, interval, next_interval)
+        self._jobs[name] = job
+        if self._started:
+            self._start_job(job)
+
+    def cancel(self, name: str):
+        """Stop refreshing `name`, keeping its snapshot until a new job replaces it."""
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            self._cancel(job)
+
+    def remove(self, name: str):
+        """Stop refreshing `name` and forget its snapshot."""
+        self.cancel(name)
+        with self._changed:
+            self._snapshots.pop(name, None)
+            self._failures.pop(name, None)
+
+    def restore(self):
+        """Load the snapshots persisted by a previous run so they can be served at once.
+
+        Restored snapshots are marked stale, in the store too, and are replaced as
+        soon as the corresponding job completes its first refresh.
+        """
+        if self.store is None:
+            return
+        try:
+            restored = self.store.load_all()
+            self.store.mark_stale()
+        except Exception as e:
+            print(f'Failed to restore snapshots: {e}')
+            return
+        with self._changed:
+            for name, snapshot in restored.items():
+                self._snapshots.setdefault(name, snapshot)
+            self._changed.notify_all()
+
+    def start(self):
+        """Start one refresh thread per registered job."""
+        if self._started:
+            return
+        self._started = True
+        self._stopped.clear()
+        for job in self._jobs.values():
+            self._start_job(job)
+
+    def follow(self, poll_interval: float = 1.0):
+        """Mirror the snapshots another process publishes to `store`, without refreshing.
+
+        Used by web workers in production: a single scraper process runs the jobs and
+        every worker picks up its snapshots from the shared store.
+
+        Args:
+            poll_interval (float): Seconds between two checks of the store.
+        """
+        if self.store is None:
+            raise ValueError('Following requires a snapshot store')
+        if self._started:
+            return
+        self._started = True
+        self._stopped.clear()
+        threading.Thread(
+            target=self._follow, args=(poll_interval,), name='snapshot-follower', daemon=True
+        ).start()
+
+    def stop(self):
+        """Ask every refresh job to exit after its current call."""
+        self._stopped.set()
+        for job in self._jobs.values():
+            self._wake(job)
+        self._started = False
+
+    def refresh(self, name: str):
+        """Wake the refresh job for `name` so it fetches immediately."""
+        job = self._jobs.get(name)
+        if job is not None:
+            job.forced = True
+            self._wake(job)
+
+    def get(self, name: str) -> Snapshot | None:
+        """Return the latest snapshot for `name`, or None if none exists yet."""
+        return self._snapshots.get(name)
+
+    def snapshots(self) -> dict[str, Snapshot]:
+        """Return a copy of the latest snapshot of every job that has one."""
+        return dict(self._snapshots)
+
+    def changed_since(self, versions: dict[str, int]) -> dict[str, Snapshot]:
+        """Return the snapshots whose version differs from the one in `versions`.
+
+        Args:
+            versions (dict[str, int]): Versions the caller already holds, by job name.
+
+        Returns:
+            dict[str, Snapshot]: Snapshots the caller has not seen yet.
+        """
+        return {
+            name: snapshot for name, snapshot in self._snapshots.items()
+            if versions.get(name) != snapshot.version
+        }
+
+    def wait_for_changes(self, versions: dict[str, int], timeout: float) -> dict[str, Snapshot]:
+        """Block until a snapshot newer than `versions` exists, or `timeout` seconds pass.
+
+        Returns:
+            dict[str, Snapshot]: Snapshots the caller has not seen yet; empty on timeout.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.changed_since(versions), timeout=timeout)
+            return self.changed_since(versions)
+
+    def wait(self, name: str, timeout: float) -> Snapshot | None:
+        """Return the snapshot for `name`, waiting up to `timeout` seconds for the first one.
+
+        Stops waiting early if a refresh of `name` failed, since there is nothing to
+        serve until a later one succeeds.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: name in self._snapshots or name in self._failures, timeout=timeout
+            )
+        return self._snapshots.get(name)
+
+    def failure(self, name: str) -> str | None:
+        """Return the error of the latest refresh of `name` if it failed, else None."""
+        return self._failures.get(name)
+
+    def _start_job(self, job: _Job):
+        job.task = event_loop.submit(self._run(job))
+
+    def _wake(self, job: _Job):
+        if job.wakeup is not None:
+            event_loop.call_soon(job.wakeup.set)
+
+    def _cancel(self, job: _Job):
+        job.cancelled = True
+        self._wake(job)
+
+    def _running(self, job: _Job) -> bool:
+        return not self._stopped.is_set() and not job.cancelled
+
+    async def _run(self, job: _Job):
+        import asyncio
+
+        job.wakeup = asyncio.Event()
+        while self._running(job):
+            job.wakeup.clear()
+            job.forced = False
+            await self._refresh_job(job)
+            job.refreshed_at = time.monotonic()
+            job.due = job.refreshed_at + self._next_wait(job)
+            if job.failures:
+                retry = self.RETRY_INTERVAL * 2 ** min(job.failures - 1, 16)
+                job.due = min(job.due, job.refreshed_at + retry)
+            await self._sleep(job)
+
+    async def _sleep(self, job: _Job):
+        import asyncio
+
+        # refresh() and add() move `due` and wake the job up to re-check it.
+        while self._running(job):
+            remaining = job.due - time.monotonic()
+            if remaining <= 0 or job.forced:
+                return
+            try:
+                await asyncio.wait_for(job.wakeup.wait(), remaining)
+            except TimeoutError:
+                pass
+            job.wakeup.clear()
+
+    def _next_wait(self, job: _Job) -> float:
+        if job.next_interval is None:
+            return job.interval
+        try:
+            return max(float(job.next_interval(job.interval)), self.MIN_INTERVAL)
+        except Exception as e:
+            print(f"Failed to schedule module '{job.name}': {e}")
+            return job.interval
+
+    def _follow(self, poll_interval: float):
+        while not self._stopped.is_set():
+            known = {
+                name: (snapshot.fetched_at, snapshot.stale)
+                for name, snapshot in self._snapshots.items()
+            }
+            try:
+                newer = self.store.load_newer(known)
+                failures = self.store.load_failures()
+            except Exception as e:
+                print(f'Failed to read snapshots: {e}')
+                newer, failures = {}, self._failures
+            if newer or failures != self._failures:
+                with self._changed:
+                    self._snapshots.update(newer)
+                    self._failures = failures
+                    self._changed.notify_all()
+            self._stopped.wait(poll_interval)
+
+    async def _refresh_job(self, job: _Job):
+        import inspect
+
+        try:
+            with timed(MODULE_SECONDS, MODULE_ERRORS, module=job.name, stage='api'):
+                if inspect.iscoroutinefunction(job.func):
+                    # Not profiled: cProfile can't tell this refresh from the other
+                    # coroutines interleaved with it on the loop.
+                    data = await job.func()
+                else:
+                    data = await event_loop.run_sync(self._call_sync, job)
+        except Exception as e:
+            if job.cancelled:
+                # Removed or replaced while fetching (its module may have been closed).
+                return
+            print(f"Failed to refresh module '{job.name}': {e}")
+            job.failures += 1
+            # Persisting the failure writes to disk, so keep it off the loop.
+            await event_loop.run_sync(self._publish_failure, job.name, f'{type(e).__name__}: {e}')
+            return
+        job.failures = 0
+        if job.cancelled:
+            # Removed or replaced while fetching; its data is no longer wanted.
+            return
+        await event_loop.run_sync(self._publish, job.name, data)
+
+    def _call_sync(self, job: _Job) -> Any:
+        with profiler.profile('api', job.name):
+            return job.func()
+
+    def _publish(self, name: str, data: Any):
+        with self._changed:
+            previous = self._snapshots.get(name)
+            if previous is None:
+                version = 1
+            elif previous.data == data:
+                version = previous.version
+            else:
+                version = previous.version + 1
+            snapshot = Snapshot(data=data, version=version, fetched_at=time.time())
+            self._snapshots[name] = snapshot
+            self._failures.pop(name, None)
+            self._changed.notify_all()
+        if self.store is not None:
+            try:
+                self.store.save(name, snapshot)
+            except Exception as e:
+                print(f"Failed to persist snapshot for module '{name}': {e}")
+
+    def _publish_failure(self, name: str, error: str):
+        with self._changed:
+            self._failures[name] = error
+            self._changed.notify_all()
+        if self.store is not None:
+            try:
+                self.store.save_failure(name, error, time.time())
+            except Exception as e:
+                print(f"Failed to persist failure for module '{name}': {e}")
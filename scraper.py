@@ -0,0 +1,44 @@
+# scraper.py
+
+"""
+Scraper process for production deployments.
+
+Runs every API module's background refresh and publishes the snapshots to the shared
+snapshot store, where the web workers started by serve.py pick them up. Only this
+process starts browsers or talks to upstream sites, so it serves its own `/metrics`
+on `SCRAPER_METRICS_PORT` and publishes its `/status` reports to the store, for the
+web workers to answer with.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app import init_app
+from config import SCRAPER_METRICS_PORT
+from metrics import metrics
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Answer `GET /metrics` with the scraper's metrics."""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == '__main__':
+    init_app('scraper')
+    if SCRAPER_METRICS_PORT:
+        ThreadingHTTPServer(('0.0.0.0', SCRAPER_METRICS_PORT), MetricsHandler).serve_forever()
+    else:
+        threading.Event().wait()
@@ -0,0 +1,129 @@
+# selector.py
+
+"""
+Compiled CSS selector files for scraping modules.
+
+Modules keep their CSS selectors in a `tag.toml` file. `load_selectors()` parses the
+file once, compiles every selector with soupsieve and caches the result until the
+file's mtime changes, so a broken selector is reported when the file is loaded
+rather than as an error halfway through a request. `parse_html()` builds the trees
+those selectors run on.
+"""
+
+import importlib.util
+import os
+import threading
+
+import toml
+
+# lxml parses several times faster than html.parser; fall back when it is missing.
+# Only look the package up here: importing it is left to the first parse.
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+class SelectorError(ValueError):
+    """Raised when a selector file cannot be parsed or contains an invalid selector."""
+
+
+class SelectorFile:
+    """A TOML selector file compiled into soupsieve selectors.
+
+    Example:
+        selectors = SelectorFile('modules/weather/tag.toml').get()
+        tag = selectors['location']['location'].select_one(soup)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = None
+        self._selectors = None
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        """Return the compiled selectors, reloading the file if it changed on disk.
+
+        Returns:
+            dict: Mapping of TOML section to a mapping of key to compiled `SoupSieve`.
+
+        Raises:
+            SelectorError: If the file cannot be read or a selector is invalid.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            raise SelectorError(f'Cannot read selector file {self.path}: {e}') from e
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._selectors = self._compile()
+                    self._mtime = mtime
+        return self._selectors
+
+    def _compile(self) -> dict:
+        # soupsieve takes tens of milliseconds to import; only selector users pay for it.
+        import soupsieve
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                raw = toml.load(file)
+        except (OSError, toml.TomlDecodeError) as e:
+            raise SelectorError(f'Cannot load selector file {self.path}: {e}') from e
+        compiled = {}
+        for section, entries in raw.items():
+            if not isinstance(entries, dict):
+                raise SelectorError(f'{self.path}: [{section}] must be a table of selectors')
+            compiled[section] = {}
+            for key, pattern in entries.items():
+                try:
+                    compiled[section][key] = soupsieve.compile(pattern)
+                except (soupsieve.SelectorSyntaxError, TypeError) as e:
+                    raise SelectorError(
+                        f'{self.path}: invalid selector {section}.{key}: {e}'
+                    ) from e
+        return compiled
+
+
+def parse_html(markup, only_ids: list[str] | None = None):
+    """Parse an HTML page with the fastest available parser.
+
+    BeautifulSoup is imported on first use, so modules that scrape pages do not slow
+    down application startup.
+
+    Args:
+        markup (str | bytes): Page source. Pass bytes to let the parser detect the
+            encoding from the page itself.
+        only_ids (list[str] | None): If given, only the subtrees of the elements with
+            these ids are parsed and everything else is skipped.
+
+    Returns:
+        BeautifulSoup: Parsed tree.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if only_ids is None:
+        return BeautifulSoup(markup, HTML_PARSER)
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=SoupStrainer(id=only_ids))
+
+
+_selector_files: dict[str, SelectorFile] = {}
+_selector_files_lock = threading.Lock()
+
+
+def load_selectors(path: str) -> dict:
+    """Return the compiled selectors for a TOML file, shared across callers.
+
+    Args:
+        path (str): Path to the selector file (e.g., a module's `tag.toml`).
+
+    Returns:
+        dict: Mapping of TOML section to a mapping of key to compiled `SoupSieve`.
+
+    Raises:
+        SelectorError: If the file cannot be read or a selector is invalid.
+    """
+    path = os.path.abspath(path)
+    selector_file = _selector_files.get(path)
+    if selector_file is None:
+        with _selector_files_lock:
+            selector_file = _selector_files.setdefault(path, SelectorFile(path))
+    return selector_file.get()
@@ -0,0 +1,74 @@
+# serve.py
+
+"""
+Production entry point for the Smart Mirror project.
+
+Starts one scraper process that refreshes module data and a multi-worker gunicorn
+server that serves it. Browser and upstream usage stay the same however many
+workers are configured, because only the scraper fetches anything.
+
+Usage:
+    python serve.py
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from config import PORT, THREADS, WORKERS
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_scraper():
+    return subprocess.Popen([sys.executable, os.path.join(ROOT, 'scraper.py')], cwd=ROOT)
+
+
+def start_web():
+    return subprocess.Popen([
+        sys.executable, '-m', 'gunicorn',
+        '--bind', f'0.0.0.0:{PORT}',
+        '--workers', str(WORKERS),
+        '--worker-class', 'gthread',
+        '--threads', str(THREADS),
+        'wsgi:app',
+    ], cwd=ROOT)
+
+
+def main():
+    scraper = start_scraper()
+    web = start_web()
+    # Set once a shutdown is requested; gunicorn may take a while to finish its
+    # graceful shutdown, and the scraper must not be restarted meanwhile.
+    stopping = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for process in (web, scraper):
+            if process.poll() is None:
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # Keep the scraper alive for as long as the web server runs.
+    while web.poll() is None:
+        if scraper.poll() is not None and not stopping:
+            print(f'Scraper exited with code {scraper.returncode}; restarting it.')
+            time.sleep(1)
+            if not stopping:
+                scraper = start_scraper()
+        time.sleep(1)
+
+    if scraper.poll() is None:
+        scraper.terminate()
+    scraper.wait()
+    sys.exit(web.returncode)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# singleflight.py
+
+"""
+Coalescing of concurrent identical calls.
+
+While a call for a key is running, other callers with the same key don't start
+their own: they wait for it and all get its result, or its exception. Used for
+upstream fetches, so a burst of identical requests costs one upstream call. Module
+`api()` refreshes need no coalescing: each module's scheduler job is the only caller
+of its `api()`.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+from metrics import CACHE_REQUESTS
+
+
+class _Call:
+    """One in-flight call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome.
+
+    Example:
+        flights = SingleFlight('upstream')
+        response = flights.do(url, lambda: session.get(url))
+    """
+
+    def __init__(self, name: str, timeout: float | None = None):
+        """
+        Args:
+            name (str): Label of the `smartmirror_cache_requests_total` counter, where
+                joined calls count as hits and calls that ran as misses.
+            timeout (float | None): Seconds a caller waits for a call it joined before
+                giving up. None waits as long as the call runs.
+        """
+        self.name = name
+        self.timeout = timeout
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return `func()`, or the outcome of the call for `key` already running.
+
+        Args:
+            key (Hashable): Identifies identical calls (e.g., a URL).
+            func (Callable[[], Any]): The call to make if none is in flight.
+
+        Returns:
+            Any: The value returned by the call.
+
+        Raises:
+            Exception: Whatever the call raised, in every caller that waited for it.
+            TimeoutError: If the joined call ran longer than `timeout`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        CACHE_REQUESTS.inc(cache=self.name, result='miss' if leader else 'hit')
+        if not leader:
+            if not call.done.wait(self.timeout):
+                raise TimeoutError(
+                    f'{self.name} call for {key!r} still running after {self.timeout}s'
+                )
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently running."""
+        return len(self._calls)
@@ -0,0 +1,196 @@
+# snapshot_store.py
+
+"""
+Persistent storage for module snapshots.
+
+The scheduler writes every module's last good `api()` result to a local SQLite
+database. After a restart those snapshots are loaded back and served as stale data
+right away, while fresh fetches run in the background. In production the same
+database is how the scraper process hands snapshots to the web workers, together
+with each snapshot's staleness, the error of any module whose refresh is failing and
+the scraper's status reports (browsers, upstream hosts, circuit breakers).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from scheduler import Snapshot
+
+
+class SnapshotStore:
+    """SQLite-backed store holding the latest snapshot of each module.
+
+    Example:
+        store = SnapshotStore('data/snapshots.db')
+        store.save('weather', snapshot)
+        snapshots = store.load_all()
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Database file; parent directories are created if needed.
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other processes see committed snapshots without blocking writers.
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS snapshots ('
+            ' name TEXT PRIMARY KEY,'
+            ' version INTEGER NOT NULL,'
+            ' fetched_at REAL NOT NULL,'
+            ' body BLOB NOT NULL,'
+            ' stale INTEGER NOT NULL DEFAULT 0'
+            ')'
+        )
+        columns = [row[1] for row in self._connection.execute('PRAGMA table_info(snapshots)')]
+        if 'stale' not in columns:
+            # Databases written before staleness was stored.
+            self._connection.execute(
+                'ALTER TABLE snapshots ADD COLUMN stale INTEGER NOT NULL DEFAULT 0'
+            )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS failures ('
+            ' name TEXT PRIMARY KEY,'
+            ' error TEXT NOT NULL,'
+            ' failed_at REAL NOT NULL'
+            ')'
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS status ('
+            ' name TEXT PRIMARY KEY,'
+            ' body TEXT NOT NULL,'
+            ' updated_at REAL NOT NULL'
+            ')'
+        )
+
+    def save(self, name: str, snapshot: Snapshot):
+        """Replace the stored snapshot for `name` and clear its failure, in one transaction."""
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO snapshots (name, version, fetched_at, body, stale)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    (name, snapshot.version, snapshot.fetched_at, snapshot.body,
+                     int(snapshot.stale)),
+                )
+                self._connection.execute('DELETE FROM failures WHERE name = ?', (name,))
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def save_failure(self, name: str, error: str, failed_at: float):
+        """Record that the latest refresh of `name` failed with `error`."""
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO failures (name, error, failed_at) VALUES (?, ?, ?)',
+                (name, error, failed_at),
+            )
+
+    def load_failures(self) -> dict[str, str]:
+        """Return the error of every module whose latest refresh failed, by module name."""
+        with self._lock:
+            return dict(self._connection.execute('SELECT name, error FROM failures'))
+
+    def save_status(self, reports: dict[str, object], updated_at: float):
+        """Replace the stored status reports with `reports`, keyed by report name."""
+        rows = [
+            (name, json.dumps(report, ensure_ascii=False), updated_at)
+            for name, report in reports.items()
+        ]
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO status (name, body, updated_at) VALUES (?, ?, ?)',
+                    rows,
+                )
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def load_status(self, name: str) -> tuple[object, float] | None:
+        """Return the status report stored under `name` and when it was saved, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT body, updated_at FROM status WHERE name = ?', (name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def mark_stale(self):
+        """Mark every stored snapshot stale and forget recorded failures, as after a restart."""
+        with self._lock:
+            self._connection.execute('BEGIN')
+            self._connection.execute('UPDATE snapshots SET stale = 1')
+            self._connection.execute('DELETE FROM failures')
+            self._connection.execute('COMMIT')
+
+    def load_all(self, stale: bool = True) -> dict[str, Snapshot]:
+        """Return every stored snapshot.
+
+        Args:
+            stale (bool): Whether to mark the loaded snapshots as stale, as after a restart.
+
+        Returns:
+            dict[str, Snapshot]: Mapping of module name to its last saved snapshot.
+        """
+        return self.load_newer({}, stale=stale)
+
+    def load_newer(self, known: dict[str, tuple[float, bool]],
+                   stale: bool | None = None) -> dict[str, Snapshot]:
+        """Return the stored snapshots whose fetch time or staleness differs from `known`.
+
+        Only the small (name, fetched_at, stale) index is read for unchanged modules,
+        so polling this from another process is cheap.
+
+        Args:
+            known (dict[str, tuple[float, bool]]): `(fetched_at, stale)` of the snapshots
+                the caller holds.
+            stale (bool | None): Whether to mark the loaded snapshots as stale. None
+                keeps the staleness they were stored with.
+
+        Returns:
+            dict[str, Snapshot]: Mapping of module name to its newer snapshot.
+        """
+        with self._lock:
+            index = self._connection.execute(
+                'SELECT name, fetched_at, stale FROM snapshots'
+            ).fetchall()
+            names = [
+                name for name, fetched_at, is_stale in index
+                if known.get(name) != (fetched_at, bool(is_stale))
+            ]
+            if not names:
+                return {}
+            rows = self._connection.execute(
+                'SELECT name, version, fetched_at, body, stale FROM snapshots'
+                f' WHERE name IN ({", ".join("?" * len(names))})',
+                names,
+            ).fetchall()
+        snapshots = {}
+        for name, version, fetched_at, body, is_stale in rows:
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                print(f"Ignoring unreadable snapshot for module '{name}': {e}")
+                continue
+            snapshots[name] = Snapshot(
+                data=data, version=version, fetched_at=fetched_at,
+                stale=bool(is_stale) if stale is None else stale,
+            )
+        return snapshots
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,107 @@
+// static/js/format_time.js
+
+// strftime-style date formatting shared by the clock and today modules. Supports the
+// C89 directives plus the ISO 8601 week date (%G, %u, %V) and two Korean extensions:
+// %K (weekday) and %P (오전/오후).
+function formatTime(format, date = new Date()) {
+    // English weekday and month names (short and full)
+    const daysShort = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
+    const daysFull = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
+    const monthsShort = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+    const monthsFull = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'];
+    // Korean weekdays array
+    const daysKorean = ['일', '월', '화', '수', '목', '금', '토'];
+
+    // Helper function to pad numbers with leading zeros
+    const pad = (num, size) => String(num).padStart(size, '0');
+
+    // Compute ISO week date values for directives %G, %u, %V
+    // ISO 8601: Week starts on Monday. The week with January 4th is week 1.
+    const iso = (function () {
+        // Compute ISO weekday: Monday = 1, ..., Sunday = 7
+        const isoWeekday = (date.getDay() === 0 ? 7 : date.getDay());
+        // Clone the date to avoid modifying the original
+        const target = new Date(date.valueOf());
+        // Adjust date to Thursday of the current week
+        target.setDate(target.getDate() - ((date.getDay() + 6) % 7) + 3);
+        // ISO week-based year is the year of that Thursday
+        const isoYear = target.getFullYear();
+        // Find the first Thursday of the ISO year (week 1)
+        const firstThursday = new Date(isoYear, 0, 4);
+        const firstDayNr = (firstThursday.getDay() + 6) % 7;
+        firstThursday.setDate(firstThursday.getDate() - firstDayNr + 3);
+        // Compute the ISO week number (1-53)
+        const weekNumber = 1 + Math.floor((target - firstThursday) / (7 * 24 * 3600 * 1000));
+        return { weekNumber, isoYear, isoWeekday };
+    })();
+
+    // Directive definitions mapping format codes to their corresponding values
+    const directives = {
+        '%Y': () => date.getFullYear(),                           // 4-digit year
+        '%m': () => pad(date.getMonth() + 1, 2),                  // 2-digit month
+        '%d': () => pad(date.getDate(), 2),                       // 2-digit day
+        '%H': () => pad(date.getHours(), 2),                      // Hour in 24-hour format
+        '%I': () => {
+            let h = date.getHours() % 12;
+            if (h === 0) h = 12;
+            return pad(h, 2);                                     // Hour in 12-hour format
+        },
+        '%M': () => pad(date.getMinutes(), 2),                    // 2-digit minute
+        '%S': () => pad(date.getSeconds(), 2),                    // 2-digit second
+        '%f': () => pad(date.getMilliseconds() * 1000, 6),        // Microseconds (approximation using milliseconds)
+        '%z': () => {                                             // UTC offset in +HHMM or -HHMM format
+            const offset = -date.getTimezoneOffset();
+            const sign = offset >= 0 ? '+' : '-';
+            const absOffset = Math.abs(offset);
+            const hours = pad(Math.floor(absOffset / 60), 2);
+            const minutes = pad(absOffset % 60, 2);
+            return sign + hours + minutes;
+        },
+        '%Z': () => {                                             // Time zone name (may vary by browser)
+            const match = date.toString().match(/\(([^)]+)\)$/);
+            return match ? match[1] : '';
+        },
+        '%j': () => {                                             // Day of the year (001-366)
+            const start = new Date(date.getFullYear(), 0, 0);
+            const diff = date - start;
+            const oneDay = 1000 * 60 * 60 * 24;
+            const dayOfYear = Math.floor(diff / oneDay);
+            return pad(dayOfYear, 3);
+        },
+        '%U': () => {                                             // Week number (Sunday as the first day, 00-53)
+            const start = new Date(date.getFullYear(), 0, 1);
+            const diff = date - start;
+            const oneDay = 1000 * 60 * 60 * 24;
+            return pad(Math.floor((diff / oneDay + start.getDay()) / 7), 2);
+        },
+        '%W': () => {                                             // Week number (Monday as the first day, 00-53)
+            const start = new Date(date.getFullYear(), 0, 1);
+            const startDay = (start.getDay() + 6) % 7;            // Adjust so Monday = 0
+            const diff = date - start;
+            const oneDay = 1000 * 60 * 60 * 24;
+            return pad(Math.floor((diff / oneDay + startDay) / 7), 2);
+        },
+        '%a': () => daysShort[date.getDay()],                     // Abbreviated weekday name in English
+        '%A': () => daysFull[date.getDay()],                      // Full weekday name in English
+        '%b': () => monthsShort[date.getMonth()],                 // Abbreviated month name in English
+        '%B': () => monthsFull[date.getMonth()],                  // Full month name in English
+        '%c': () => date.toLocaleString(),                        // Locale date and time representation
+        '%x': () => date.toLocaleDateString(),                    // Locale date representation
+        '%X': () => date.toLocaleTimeString(),                    // Locale time representation
+        '%%': () => '%',                                          // Literal '%'
+        '%G': () => iso.isoYear,                                  // ISO 8601 week-based year (C89 additional specifier)
+        '%u': () => iso.isoWeekday,                               // ISO 8601 weekday as a number (1=Monday, 7=Sunday) (C89 additional specifier)
+        '%V': () => pad(iso.weekNumber, 2),                       // ISO 8601 week number (01-53) (C89 additional specifier)
+        '%K': () => daysKorean[date.getDay()],                    // Korean weekday (custom directive)
+        '%P': () => date.getHours() < 12 ? '오전' : '오후'        // Korean AM/PM (custom directive)
+    };
+
+    // Replace all directives in the format string using regex
+    return format.replace(/%[a-zA-Z%]/g, match => {
+        if (directives[match]) {
+            return directives[match]();
+        } else {
+            return match; // Return unrecognized directives as-is
+        }
+    });
+}
@@ -0,0 +1,102 @@
+// static/js/script.js
+
+// Shared client for the modules' scripts. Each module's script registers an init
+// function, and the module's template passes its configuration with configure();
+// start() runs the init of every module on the page.
+//
+// Module scripts subscribe to their module's API data. Updates are pushed over one
+// server-sent events stream (/api/stream); while the stream is down, the client falls
+// back to polling /api/all, sending the versions it already holds so unchanged modules
+// are not transferred again.
+const SmartMirror = (() => {
+    const inits = {};
+    const configs = {};
+    const handlers = {};
+    const versions = {};
+    let pollInterval = 60000;
+    let pollTimer = null;
+
+    function register(name, init) {
+        inits[name] = init;
+    }
+
+    function configure(name, config) {
+        configs[name] = config;
+    }
+
+    function subscribe(name, handler) {
+        (handlers[name] = handlers[name] || []).push(handler);
+    }
+
+    function dispatch(name, entry) {
+        if (versions[name] === entry.version) {
+            return;
+        }
+        versions[name] = entry.version;
+        (handlers[name] || []).forEach(handler => {
+            try {
+                handler(entry.data);
+            } catch (error) {
+                console.error(`Error updating ${name} module:`, error);
+            }
+        });
+    }
+
+    function poll() {
+        const params = new URLSearchParams(versions);
+        return fetch(`/api/all?${params}`)
+            .then(response => response.json())
+            .then(data => {
+                Object.entries(data).forEach(([name, entry]) => dispatch(name, entry));
+            })
+            .catch(error => console.error('Error fetching module data:', error));
+    }
+
+    function startPolling() {
+        if (pollTimer === null) {
+            poll();
+            pollTimer = setInterval(poll, pollInterval);
+        }
+    }
+
+    function stopPolling() {
+        if (pollTimer !== null) {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        }
+    }
+
+    function connect() {
+        if (!window.EventSource) {
+            startPolling();
+            return;
+        }
+        const params = new URLSearchParams(versions);
+        const source = new EventSource(`/api/stream?${params}`);
+        source.addEventListener('update', event => {
+            const entry = JSON.parse(event.data);
+            dispatch(entry.module, entry);
+        });
+        source.onopen = () => stopPolling();
+        source.onerror = () => {
+            // Reconnect ourselves so the new stream starts from the versions we hold.
+            source.close();
+            startPolling();
+            setTimeout(connect, pollInterval);
+        };
+    }
+
+    function start(interval) {
+        Object.entries(configs).forEach(([name, config]) => {
+            try {
+                (inits[name] || (() => {}))(config);
+            } catch (error) {
+                console.error(`Error starting ${name} module:`, error);
+            }
+        });
+        pollInterval = interval;
+        connect();
+    }
+
+    return { register, configure, subscribe, start };
+})();
@@ -0,0 +1,88 @@
+# tests/test_weather_backends.py
+
+"""
+The weather module must extract the same data whichever backend fetched the pages.
+
+Both backends load the saved Naver pages from the benchmark fixture server: the HTTP
+backend directly, the Selenium backend through a stand-in browser that returns the
+page source as downloaded. Run with `python -m unittest discover tests`.
+"""
+
+import importlib.util
+import unittest
+from contextlib import contextmanager
+from urllib.request import urlopen
+
+from benchmarks.fixture_server import FixtureServer
+from modules.weather.backend import HTTPBackend, SeleniumBackend
+from modules.weather.module import WeatherModule
+
+
+class FakeDriver:
+    """Stands in for Chrome: `get()` downloads the page instead of rendering it."""
+
+    def __init__(self, loaded: list[str]):
+        self.loaded = loaded
+        self.page_source = ''
+
+    def get(self, url):
+        self.loaded.append(url)
+        with urlopen(url) as response:
+            self.page_source = response.read().decode('utf-8')
+
+    def find_element(self, by, value):
+        # Every wait selector is found at once.
+        return object()
+
+
+class FakePool:
+    """DriverPool stand-in lending out `FakeDriver`s."""
+
+    def __init__(self):
+        self.loaded: list[str] = []
+
+    @contextmanager
+    def driver(self):
+        yield FakeDriver(self.loaded)
+
+
+@unittest.skipUnless(importlib.util.find_spec('selenium'), 'selenium is not installed')
+class WeatherBackendParityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FixtureServer()
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def weather_module(self, backend):
+        module = WeatherModule()
+        module.backend = backend
+        module.WEATHER_URL = self.server.url('naver_weather.html')
+        module.AIR_URL = self.server.url('naver_air.html')
+        return module
+
+    def test_selenium_and_http_backends_give_the_same_api_data(self):
+        selenium_backend = SeleniumBackend()
+        selenium_backend._pool = FakePool()
+
+        http_data = self.weather_module(HTTPBackend()).api()
+        selenium_data = self.weather_module(selenium_backend).api()
+
+        self.assertEqual(
+            sorted(selenium_backend._pool.loaded),
+            sorted([self.server.url('naver_weather.html'), self.server.url('naver_air.html')]),
+        )
+        self.assertEqual(selenium_data, http_data)
+        self.assertEqual(set(http_data), {'location', 'alarm', 'weekly', 'weather'})
+        self.assertTrue(http_data['location'])
+        self.assertTrue(http_data['weekly'])
+        self.assertTrue(http_data['weather']['now_temperature'])
+        self.assertIn('quick_pm10', http_data['weather'])
+
+
+if __name__ == '__main__':
+    unittest.main()
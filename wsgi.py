@@ -0,0 +1,16 @@
+# wsgi.py
+
+"""
+WSGI entry point for production web workers.
+
+Workers only serve module data; the snapshots are produced by the separate scraper
+process (see scraper.py and serve.py) and shared through the snapshot store.
+
+Example:
+    gunicorn --workers 4 --worker-class gthread --threads 8 wsgi:app
+"""
+
+from app import app, init_app
+
+
+init_app('web')